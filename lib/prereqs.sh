@@ -21,7 +21,6 @@ declare -a PREREQS=(
     "curl|HTTP client for API calls|apt install -y curl|dnf install -y curl|pacman -S --noconfirm curl|1"
     "sqlite3|SQLite database for caching|apt install -y sqlite3|dnf install -y sqlite|pacman -S --noconfirm sqlite|1"
     "python3|Python interpreter for dashboard|apt install -y python3|dnf install -y python3|pacman -S --noconfirm python|1"
-    "vmstat|System stats for CPU/memory|apt install -y procps|dnf install -y procps-ng|pacman -S --noconfirm procps-ng|1"
     "awk|Text processing for stats|apt install -y gawk|dnf install -y gawk|pacman -S --noconfirm gawk|1"
 )
 
@@ -43,6 +42,9 @@ declare -a PYTHON_WEB_PACKAGES=(
     "uvicorn|ASGI server for FastAPI"
     "jinja2|Template engine for FastAPI"
     "sse_starlette|Server-Sent Events for FastAPI"
+    "orjson|Fast JSON encoder for API responses"
+    "uvloop|Fast event loop for the ASGI server"
+    "httptools|Fast HTTP parser for the ASGI server"
 )
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -10,34 +10,50 @@ Features:
 - All peer columns available
 """
 
-import json
+import asyncio
+import functools
+import importlib.util
+import ipaddress
+import itertools
 import os
+import platform
 import queue
+import re
+import select
+import shutil
 import socket
 import sqlite3
 import subprocess
 import sys
 import threading
 import time
+import uuid
+from collections import OrderedDict, deque
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+import orjson
 import requests
-import uvicorn
 from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse
+from fastapi.exceptions import RequestValidationError
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from sse_starlette.sse import EventSourceResponse
+from pydantic import BaseModel
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # CONFIGURATION
 # ═══════════════════════════════════════════════════════════════════════════════
 
 REFRESH_INTERVAL = 10  # Seconds between peer refreshes
-GEO_API_DELAY = 1.5    # Seconds between API calls
-GEO_API_URL = "http://ip-api.com/json"
+GEO_API_BATCH_URL = "http://ip-api.com/batch"
+GEO_API_BATCH_SIZE = 100   # ip-api's per-request limit for /batch
+GEO_API_BATCH_DELAY = 4.0  # /batch is limited to 15 requests/minute on the free tier
+GEO_API_OUTAGE_DELAY = 60  # First back-off after a failed /batch request (doubles per consecutive failure)
+GEO_API_OUTAGE_DELAY_MAX = 900
 # All available fields from ip-api.com (except query, status, message, reverse)
 GEO_API_FIELDS = "status,continent,continentCode,country,countryCode,region,regionName,city,district,zip,lat,lon,timezone,offset,currency,isp,org,as,asname,mobile,proxy,hosting"
 RECENT_WINDOW = 20     # Seconds for recent changes
@@ -55,6 +71,9 @@ DATA_DIR = PROJECT_DIR / 'data'
 TMP_DIR = DATA_DIR / 'tmp'
 CONFIG_FILE = DATA_DIR / 'config.conf'
 GEO_DB_FILE = DATA_DIR / 'geo.db'  # Geolocation cache database
+NET_CACHE_FILE = DATA_DIR / 'netcache.json'  # Last LAN IP / firewall detection
+ADDRMAN_CACHE_FILE = DATA_DIR / 'addrman_cache.json'  # addrman snapshot saved at shutdown
+GEO_RETRY_FILE = DATA_DIR / 'geo_retry.json'  # Failed ip-api lookups and when they were last tried
 STATIC_DIR = SCRIPT_DIR / 'static'
 TEMPLATES_DIR = SCRIPT_DIR / 'templates'
 VERSION_FILE = PROJECT_DIR / 'VERSION'
@@ -112,6 +131,7 @@ def save_port_to_config(port: int):
         print(f"Warning: Could not save port to config: {e}")
 
 
+@functools.lru_cache(maxsize=1)
 def detect_active_firewall():
     """Detect if ufw or firewalld is active. Returns (name, is_active) or (None, False)"""
     try:
@@ -138,37 +158,117 @@ def detect_active_firewall():
 
     return (None, False)
 
+
+NET_CACHE_MAX_AGE = 86400  # Seconds a cached LAN/firewall detection is trusted at startup
+
+
+def get_net_fingerprint() -> str:
+    """Cheap identity of this machine + install (MAC, OS, hostname, version) for the net cache"""
+    return f"{uuid.getnode():012x}|{platform.system()}|{socket.gethostname()}|{VERSION}"
+
+
+def load_net_cache() -> Optional[dict]:
+    """Return the cached get_local_ips()/detect_active_firewall() results if fresh and for this machine"""
+    try:
+        cached = orjson.loads(NET_CACHE_FILE.read_bytes())
+        if cached.get('fingerprint') != get_net_fingerprint():
+            return None
+        if time.time() - cached.get('timestamp', 0) > NET_CACHE_MAX_AGE:
+            return None
+        return cached
+    except Exception:
+        return None
+
+
+def save_net_cache(local_ips: list, subnets: list, firewall_name, firewall_active: bool):
+    """Persist the latest LAN/firewall detection for the next startup"""
+    try:
+        DATA_DIR.mkdir(parents=True, exist_ok=True)
+        NET_CACHE_FILE.write_bytes(orjson.dumps({
+            'fingerprint': get_net_fingerprint(),
+            'local_ips': local_ips,
+            'subnets': subnets,
+            'firewall_name': firewall_name,
+            'firewall_active': firewall_active,
+            'timestamp': int(time.time()),
+        }))
+    except Exception as e:
+        print(f"Warning: Could not save network cache: {e}")
+
+
 # Geo status codes
 GEO_OK = 0
 GEO_PRIVATE = 1
 GEO_UNAVAILABLE = 2
 
-RETRY_INTERVALS = [86400, 259200, 604800, 604800]
+RETRY_INTERVALS = [86400, 259200, 604800, 604800]  # Backoff before re-asking ip-api about an IP it failed on
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # GLOBAL STATE
 # ═══════════════════════════════════════════════════════════════════════════════
 
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson (much faster than stdlib json for the peer list).
+
+    Polling routes return it directly: a plain dict return is first walked by FastAPI's
+    jsonable_encoder, which the content never needs.
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
+
+
 # FastAPI app
-app = FastAPI(title="MBTC-DASH", description="Bitcoin Peer Dashboard")
+app = FastAPI(title="MBTC-DASH", description="Bitcoin Peer Dashboard", default_response_class=ORJSONResponse)
+# Compress JSON responses >= 1KB for clients that accept gzip (Starlette leaves text/event-stream alone)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
 
-# Thread-safe state
+
+@app.exception_handler(RequestValidationError)
+async def validation_error_handler(request: Request, exc: RequestValidationError):
+    """Malformed POST bodies answer in the same {success, error} shape the dashboard reads"""
+    errors = exc.errors()
+    error = f"{errors[0]['loc'][-1]}: {errors[0]['msg']}" if errors else 'Invalid request'
+    return ORJSONResponse({'success': False, 'error': error}, status_code=422)
+
+
+class PeerIdBody(BaseModel):
+    peer_id: Optional[int] = None
+
+
+class AddressBody(BaseModel):
+    address: Optional[str] = None
+
+# Thread-safe state (current_peers_by_id indexes the same getpeerinfo snapshot by peer id)
 current_peers = []
+current_peers_by_id = {}
 peers_lock = threading.Lock()
 
-recent_changes = []
+recent_changes = deque()  # (time, type, peer), oldest first
 changes_lock = threading.Lock()
 
-geo_queue = queue.Queue()
-pending_lookups = set()
-pending_lock = threading.Lock()
+# Geo lookup backlog: {ip: network_type} in arrival order. An IP stays in it until its lookup has
+# finished, so key presence alone dedupes both queued and in-flight lookups
+geo_pending = OrderedDict()
+geo_pending_cv = threading.Condition()
 
 stop_flag = threading.Event()
 
-# SSE clients and update events
-sse_update_event = threading.Event()
-last_update_type = "connected"
+# SSE clients: one asyncio.Queue per connected client, owned by the server loop (threads use publish_sse)
+SSE_PING_INTERVAL = 15  # Seconds between keep-alive comments on an idle stream (keeps proxies from timing out)
+SSE_QUEUE_SIZE = 32  # Events buffered per client before a stalled client starts missing them
+sse_subscribers = set()
+sse_loop = None
+# SSE data strings, serialized once (per broadcast for update payloads) and shared by all clients
+SSE_CONNECTED = orjson.dumps({"type": "connected"}).decode()
+
+# /api/peers body cache - every broadcast bumps the generation, so the body is rebuilt at most once
+# per data change; the boot id keeps ETags from a previous run from matching
+peers_generation = 0
+peers_generation_lock = threading.Lock()
+PEERS_ETAG_BOOT_ID = format(int(time.time()), 'x')
+_peers_body_cache = (-1, b'')
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # SESSION CACHE (in-memory, cleared on restart)
@@ -176,16 +276,30 @@ last_update_type = "connected"
 
 # Geo cache: {ip: {continent, continentCode, country, countryCode, region, regionName, city, lat, lon, isp, status}}
 geo_cache = {}
+GEO_CACHE_MAX = 10000  # Past this, IPs that are no longer connected are dropped (geo.db still has them)
+
+# Geo record with every field blank - used for private/unavailable IPs and for IPs not looked up yet
+_EMPTY_GEO = {
+    'status': '',
+    'continent': '', 'continentCode': '',
+    'country': '', 'countryCode': '',
+    'region': '', 'regionName': '',
+    'city': '', 'district': '', 'zip': '',
+    'lat': 0, 'lon': 0,
+    'timezone': '', 'offset': 0, 'currency': '',
+    'isp': '', 'org': '', 'as': '', 'asname': '',
+    'mobile': False, 'proxy': False, 'hosting': False,
+}
 geo_cache_lock = threading.Lock()
 
+# Failed ip-api lookups: {ip: [failures, last_attempt]} - persisted so restarts honour RETRY_INTERVALS
+geo_retry = {}
+geo_retry_lock = threading.Lock()
+
 # Peer ID to IP mapping (so we have IP when peer disconnects)
 peer_ip_map = {}
 peer_ip_map_lock = threading.Lock()
 
-# Track pending geo lookups count for map status
-geo_pending_count = 0
-geo_pending_lock = threading.Lock()
-
 # Addrman cache: {addr: True/False} - populated from getnodeaddresses
 addrman_cache = set()
 addrman_cache_lock = threading.Lock()
@@ -267,6 +381,84 @@ def cleanup_tmp_dir():
                 pass
 
 
+# Idle read-only connections kept open for geo.db (WAL lets them read while a writer commits)
+GEO_DB_READ_POOL_SIZE = 4
+GEO_DB_STATEMENT_CACHE = 256  # Prepared statements kept per connection (sqlite3 default is 128)
+_geo_read_pool = queue.Queue(maxsize=GEO_DB_READ_POOL_SIZE)
+
+# Single shared write connection, opened on first use and serialized by its lock
+_geo_writer = None
+_geo_writer_lock = threading.Lock()
+
+
+def _tune_geo_conn(conn: sqlite3.Connection) -> sqlite3.Connection:
+    """Per-connection PRAGMAs shared by the reader pool and the writer"""
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA cache_size=-64000')  # 64MB page cache ceiling
+    conn.execute('PRAGMA mmap_size=134217728')  # Read pages straight from a 128MB mapping, no read() copies
+    return conn
+
+
+@contextmanager
+def geo_db_reader():
+    """Borrow a pooled read-only connection to the geo database"""
+    try:
+        conn = _geo_read_pool.get_nowait()
+    except queue.Empty:
+        conn = _tune_geo_conn(sqlite3.connect(f"{GEO_DB_FILE.as_uri()}?mode=ro", uri=True, timeout=5,
+                                              check_same_thread=False, cached_statements=GEO_DB_STATEMENT_CACHE))
+    healthy = False
+    try:
+        yield conn
+        healthy = True
+    finally:
+        if healthy:
+            try:
+                _geo_read_pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+        else:
+            conn.close()  # Don't return a possibly broken connection to the pool
+
+
+def open_geo_db_writer() -> sqlite3.Connection:
+    """Open a write connection to the geo database in WAL mode (autocommit, explicit transactions)"""
+    conn = sqlite3.connect(GEO_DB_FILE, timeout=5, isolation_level=None, check_same_thread=False,
+                           cached_statements=GEO_DB_STATEMENT_CACHE)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    return _tune_geo_conn(conn)
+
+
+@contextmanager
+def geo_db_writer():
+    """Hold the shared write connection to the geo database (opened once, reused across calls)"""
+    global _geo_writer
+    with _geo_writer_lock:
+        if _geo_writer is None:
+            _geo_writer = open_geo_db_writer()
+        try:
+            yield _geo_writer
+        except sqlite3.Error:
+            _geo_writer.close()  # Reopen on next use rather than reuse a possibly broken connection
+            _geo_writer = None
+            raise
+
+
+def close_geo_db():
+    """Close the shared writer and all pooled read connections (shutdown, or before geo.db is replaced)"""
+    global _geo_writer
+    with _geo_writer_lock:
+        if _geo_writer is not None:
+            _geo_writer.close()
+            _geo_writer = None
+    while True:
+        try:
+            _geo_read_pool.get_nowait().close()
+        except queue.Empty:
+            break
+
+
 def init_geo_database():
     """Initialize the geolocation database with full schema"""
     DATA_DIR.mkdir(parents=True, exist_ok=True)
@@ -324,6 +516,15 @@ def check_geo_db_integrity() -> tuple:
         return (False, f"Error checking database: {str(e)}")
 
 
+# Every hot-path statement is a module constant so each connection prepares it once and then
+# reuses it from sqlite3's statement cache
+_GEO_DB_STATS_SQL = '''
+    SELECT (SELECT COUNT(*) FROM geo_cache),
+           (SELECT MAX(last_updated) FROM geo_cache),
+           (SELECT MIN(last_updated) FROM geo_cache WHERE last_updated > 0)
+'''
+
+
 def get_geo_db_stats() -> dict:
     """Get statistics about the geo database with status"""
     base = {'status': 'disabled', 'entries': 0, 'size_mb': 0, 'last_updated': None, 'oldest_updated': None, 'db_path': str(GEO_DB_FILE)}
@@ -333,14 +534,9 @@ def get_geo_db_stats() -> dict:
         base['status'] = 'not_found'
         return base
     try:
-        conn = sqlite3.connect(GEO_DB_FILE)
-        cursor = conn.execute('SELECT COUNT(*) FROM geo_cache')
-        count = cursor.fetchone()[0]
-        cursor = conn.execute('SELECT MAX(last_updated) FROM geo_cache')
-        last = cursor.fetchone()[0]
-        cursor = conn.execute('SELECT MIN(last_updated) FROM geo_cache WHERE last_updated > 0')
-        oldest = cursor.fetchone()[0]
-        conn.close()
+        with geo_db_reader() as conn:
+            # One round trip; each subquery is answered from idx_geo_updated
+            count, last, oldest = conn.execute(_GEO_DB_STATS_SQL).fetchone()
         size_mb = GEO_DB_FILE.stat().st_size / (1024 * 1024)
         base.update({'status': 'ok', 'entries': count, 'size_mb': round(size_mb, 2), 'last_updated': last, 'oldest_updated': oldest})
         return base
@@ -350,85 +546,140 @@ def get_geo_db_stats() -> dict:
         return base
 
 
-def get_geo_from_db(ip: str) -> Optional[dict]:
-    """Look up IP in geo database"""
-    if not geo_db_enabled or not GEO_DB_FILE.exists():
-        return None
-    try:
-        conn = sqlite3.connect(GEO_DB_FILE)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.execute('SELECT * FROM geo_cache WHERE ip = ?', (ip,))
-        row = cursor.fetchone()
-        conn.close()
-        return dict(row) if row else None
-    except:
-        return None
+GEO_DB_STATS_TTL = 5  # Seconds /api/stats and /api/info pollers share one geo.db count
+_geo_db_stats_cache = (0.0, None)
 
 
-def save_geo_to_db(ip: str, data: dict):
-    """Save geo data to database"""
-    if not geo_db_enabled:
+def get_geo_db_stats_cached() -> dict:
+    """Copy of get_geo_db_stats(), re-queried at most once per GEO_DB_STATS_TTL.
+
+    COUNT(*) walks a whole index, which adds up on a downloaded multi-100k-entry database.
+    """
+    global _geo_db_stats_cache
+    fetched_at, stats = _geo_db_stats_cache
+    if stats is None or time.time() - fetched_at > GEO_DB_STATS_TTL:
+        stats = get_geo_db_stats()
+        _geo_db_stats_cache = (time.time(), stats)
+    return dict(stats)
+
+
+def invalidate_geo_db_stats():
+    """Make the next stats read hit geo.db (after a download/merge changes it wholesale)"""
+    global _geo_db_stats_cache
+    _geo_db_stats_cache = (0.0, None)
+
+
+# geo_cache columns read back for lookups (everything geo_entry_from_data uses - not last_updated)
+GEO_DB_LOOKUP_COLUMNS = (
+    'ip', 'continent', 'continentCode', 'country', 'countryCode', 'region', 'regionName', 'city',
+    'district', 'zip', 'lat', 'lon', 'timezone', 'utc_offset', 'currency', 'isp', 'org', 'as_info',
+    'asname', 'mobile', 'proxy', 'hosting',
+)
+_GEO_DB_LOOKUP_SELECT = f"SELECT {', '.join(GEO_DB_LOOKUP_COLUMNS)} FROM geo_cache"
+GEO_DB_LOOKUP_CHUNK = 500  # IPs per IN (...) query - stays under SQLite's bound-parameter limit
+
+
+@functools.lru_cache(maxsize=64)
+def _geo_db_get_many_sql(n: int) -> str:
+    """IN (...) lookup for n IPs - the same string object each time so the prepared statement is reused"""
+    return f"{_GEO_DB_LOOKUP_SELECT} WHERE ip IN ({','.join('?' * n)})"
+
+
+def get_geo_many_from_db(ips: list) -> dict:
+    """Look up many IPs in the geo database at once - returns {ip: row} for the ones found"""
+    if not ips or not geo_db_enabled or not GEO_DB_FILE.exists():
+        return {}
+    rows = {}
+    try:
+        with geo_db_reader() as conn:
+            for start in range(0, len(ips), GEO_DB_LOOKUP_CHUNK):
+                chunk = ips[start:start + GEO_DB_LOOKUP_CHUNK]
+                cursor = conn.execute(_geo_db_get_many_sql(len(chunk)), chunk)
+                for row in cursor:
+                    rows[row[0]] = dict(zip(GEO_DB_LOOKUP_COLUMNS, row))
+    except Exception:
+        pass
+    return rows
+
+
+_GEO_DB_UPSERT_SQL = '''
+    INSERT INTO geo_cache (
+        ip, continent, continentCode, country, countryCode,
+        region, regionName, city, district, zip,
+        lat, lon, timezone, utc_offset, currency,
+        isp, org, as_info, asname, mobile, proxy, hosting, last_updated
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(ip) DO UPDATE SET
+        continent = excluded.continent,
+        continentCode = excluded.continentCode,
+        country = excluded.country,
+        countryCode = excluded.countryCode,
+        region = excluded.region,
+        regionName = excluded.regionName,
+        city = excluded.city,
+        district = excluded.district,
+        zip = excluded.zip,
+        lat = excluded.lat,
+        lon = excluded.lon,
+        timezone = excluded.timezone,
+        utc_offset = excluded.utc_offset,
+        currency = excluded.currency,
+        isp = excluded.isp,
+        org = excluded.org,
+        as_info = excluded.as_info,
+        asname = excluded.asname,
+        mobile = excluded.mobile,
+        proxy = excluded.proxy,
+        hosting = excluded.hosting,
+        last_updated = excluded.last_updated
+'''
+
+
+def _geo_db_upsert_params(ip: str, data: dict, now: int) -> tuple:
+    """_GEO_DB_UPSERT_SQL parameters for one ip-api response"""
+    return (
+        ip,
+        data.get('continent', ''),
+        data.get('continentCode', ''),
+        data.get('country', ''),
+        data.get('countryCode', ''),
+        data.get('region', ''),
+        data.get('regionName', ''),
+        data.get('city', ''),
+        data.get('district', ''),
+        data.get('zip', ''),
+        data.get('lat', 0),
+        data.get('lon', 0),
+        data.get('timezone', ''),
+        data.get('offset', 0),
+        data.get('currency', ''),
+        data.get('isp', ''),
+        data.get('org', ''),
+        data.get('as', ''),
+        data.get('asname', ''),
+        1 if data.get('mobile', False) else 0,
+        1 if data.get('proxy', False) else 0,
+        1 if data.get('hosting', False) else 0,
+        now
+    )
+
+
+def save_geo_many_to_db(geo_by_ip: dict):
+    """Save {ip: ip-api data} to the database in one transaction (one WAL commit for the whole batch)"""
+    if not geo_db_enabled or not geo_by_ip:
         return
     try:
         now = int(time.time())
-        conn = sqlite3.connect(GEO_DB_FILE, timeout=5)
-        conn.execute('''
-            INSERT INTO geo_cache (
-                ip, continent, continentCode, country, countryCode,
-                region, regionName, city, district, zip,
-                lat, lon, timezone, utc_offset, currency,
-                isp, org, as_info, asname, mobile, proxy, hosting, last_updated
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(ip) DO UPDATE SET
-                continent = excluded.continent,
-                continentCode = excluded.continentCode,
-                country = excluded.country,
-                countryCode = excluded.countryCode,
-                region = excluded.region,
-                regionName = excluded.regionName,
-                city = excluded.city,
-                district = excluded.district,
-                zip = excluded.zip,
-                lat = excluded.lat,
-                lon = excluded.lon,
-                timezone = excluded.timezone,
-                utc_offset = excluded.utc_offset,
-                currency = excluded.currency,
-                isp = excluded.isp,
-                org = excluded.org,
-                as_info = excluded.as_info,
-                asname = excluded.asname,
-                mobile = excluded.mobile,
-                proxy = excluded.proxy,
-                hosting = excluded.hosting,
-                last_updated = excluded.last_updated
-        ''', (
-            ip,
-            data.get('continent', ''),
-            data.get('continentCode', ''),
-            data.get('country', ''),
-            data.get('countryCode', ''),
-            data.get('region', ''),
-            data.get('regionName', ''),
-            data.get('city', ''),
-            data.get('district', ''),
-            data.get('zip', ''),
-            data.get('lat', 0),
-            data.get('lon', 0),
-            data.get('timezone', ''),
-            data.get('offset', 0),
-            data.get('currency', ''),
-            data.get('isp', ''),
-            data.get('org', ''),
-            data.get('as', ''),
-            data.get('asname', ''),
-            1 if data.get('mobile', False) else 0,
-            1 if data.get('proxy', False) else 0,
-            1 if data.get('hosting', False) else 0,
-            now
-        ))
-        conn.commit()
-        conn.close()
+        rows = [_geo_db_upsert_params(ip, data, now) for ip, data in geo_by_ip.items()]
+        with geo_db_writer() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.executemany(_GEO_DB_UPSERT_SQL, rows)
+                conn.execute('COMMIT')
+            except Exception:
+                if conn.in_transaction:
+                    conn.execute('ROLLBACK')
+                raise
     except Exception as e:
         print(f"Error saving to geo database: {e}")
 
@@ -437,57 +688,91 @@ def refresh_addrman_cache():
     """Refresh the addrman cache from getnodeaddresses"""
     global addrman_cache
     try:
-        cmd = config.get_cli_command() + ['getnodeaddresses', '0']  # 0 = all addresses
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-        if result.returncode == 0:
-            addresses = json.loads(result.stdout)
-            new_cache = set()
-            for addr_info in addresses:
-                addr = addr_info.get('address', '')
-                if addr:
-                    new_cache.add(addr)
-            with addrman_cache_lock:
-                addrman_cache = new_cache
+        # 0 = all addresses: a capped count is a random sample, which would make in_addrman guesswork
+        addresses = rpc_call('getnodeaddresses', 0)
+        new_cache = {addr for addr in (info.get('address') for info in addresses) if addr}
+        with addrman_cache_lock:
+            addrman_cache = new_cache
     except Exception as e:
         print(f"Addrman refresh error: {e}")
 
 
-def is_in_addrman(ip: str) -> bool:
-    """Check if an IP is in the addrman cache"""
+ADDRMAN_MAX_AGE = 300  # Seconds a saved addrman snapshot can stand in for the startup refresh
+
+
+def _addrman_cache_age() -> float:
+    """Seconds since the addrman snapshot file was written (inf if there is none)"""
+    try:
+        return time.time() - os.path.getmtime(ADDRMAN_CACHE_FILE)
+    except OSError:
+        return float('inf')
+
+
+def load_addrman_cache() -> bool:
+    """Seed addrman_cache from the saved snapshot. Returns False if it could not be read"""
+    global addrman_cache
+    try:
+        new_cache = set(orjson.loads(ADDRMAN_CACHE_FILE.read_bytes()))
+    except Exception:
+        return False
     with addrman_cache_lock:
-        return ip in addrman_cache
+        addrman_cache = new_cache
+    return True
+
+
+def save_addrman_cache():
+    """Write the current addrman_cache so a quick restart can skip getnodeaddresses"""
+    with addrman_cache_lock:
+        snapshot = addrman_cache
+    if not snapshot:
+        return
+    try:
+        ADDRMAN_CACHE_FILE.write_bytes(orjson.dumps(list(snapshot)))
+    except Exception as e:
+        print(f"Warning: Could not save addrman cache: {e}")
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # NETWORK UTILITIES
 # ═══════════════════════════════════════════════════════════════════════════════
 
+# host (bare or [bracketed] IPv6) and optional :port; anything else (e.g. bare IPv6) is all host
+_ADDR_RE = re.compile(r'^(?:\[([^\]]+)\]|([^:]+))(?::(\d+))?$')
+_NETWORK_SUFFIXES = (('.onion', 'onion'), ('.i2p', 'i2p'))
+
+
+@functools.lru_cache(maxsize=4096)
+def split_addr(addr: str) -> tuple:
+    """(ip, port) from a getpeerinfo addr; port is '' when there isn't one"""
+    m = _ADDR_RE.match(addr)
+    if not m:
+        return addr, ''
+    return m.group(1) or m.group(2), m.group(3) or ''
+
+
 def get_network_type(addr: str) -> str:
-    if '.onion' in addr:
-        return 'onion'
-    elif '.i2p' in addr:
-        return 'i2p'
-    elif addr.startswith('fc') or addr.startswith('fd'):
-        return 'cjdns'
-    elif ':' in addr and addr.count(':') > 1:
-        return 'ipv6'
+    host = split_addr(addr)[0]
+    for suffix, network_type in _NETWORK_SUFFIXES:
+        if host.endswith(suffix):
+            return network_type
+    try:
+        version = ipaddress.ip_address(host).version
+    except ValueError:
+        return 'ipv4'
+    if version == 6:
+        return 'cjdns' if host.startswith(('fc', 'fd')) else 'ipv6'
     return 'ipv4'
 
 
+@functools.lru_cache(maxsize=4096)
 def is_private_ip(ip: str) -> bool:
-    if ip.startswith('10.') or ip.startswith('192.168.'):
+    """Private, loopback, link-local or reserved address (stdlib range tables), or 'localhost'"""
+    if ip == 'localhost':
         return True
-    if ip.startswith('172.'):
-        try:
-            if 16 <= int(ip.split('.')[1]) <= 31:
-                return True
-        except:
-            pass
-    if ip.startswith('127.') or ip == 'localhost':
-        return True
-    if ip.startswith('fe80:') or ip == '::1':
-        return True
-    return False
+    try:
+        return ipaddress.ip_address(ip).is_private
+    except ValueError:
+        return False
 
 
 def is_public_address(network_type: str, ip: str) -> bool:
@@ -495,21 +780,10 @@ def is_public_address(network_type: str, ip: str) -> bool:
 
 
 def extract_ip(addr: str) -> str:
-    if addr.startswith('['):
-        return addr.split(']')[0][1:]
-    elif ':' in addr and addr.count(':') <= 1:
-        return addr.rsplit(':', 1)[0]
-    return addr.split(':')[0] if ':' in addr else addr
-
-
-def extract_port(addr: str) -> str:
-    if addr.startswith('[') and ']:' in addr:
-        return addr.split(']:')[1]
-    elif ':' in addr and addr.count(':') <= 1:
-        return addr.rsplit(':', 1)[1]
-    return ""
+    return split_addr(addr)[0]
 
 
+@functools.lru_cache(maxsize=1)
 def get_local_ips() -> list:
     """Get all local IP addresses with their subnets"""
     ips = []
@@ -528,12 +802,7 @@ def get_local_ips() -> list:
                             ips.append(ip)
                         # Calculate subnet for firewall rules
                         if '/' in ip_cidr:
-                            prefix = int(ip_cidr.split('/')[1])
-                            # Calculate network address
-                            ip_parts = [int(x) for x in ip.split('.')]
-                            mask = (0xFFFFFFFF << (32 - prefix)) & 0xFFFFFFFF
-                            net_int = (ip_parts[0] << 24 | ip_parts[1] << 16 | ip_parts[2] << 8 | ip_parts[3]) & mask
-                            net_addr = f"{(net_int >> 24) & 0xFF}.{(net_int >> 16) & 0xFF}.{(net_int >> 8) & 0xFF}.{net_int & 0xFF}/{prefix}"
+                            net_addr = str(ipaddress.IPv4Interface(ip_cidr).network)
                             if net_addr not in subnets:
                                 subnets.append(net_addr)
     except:
@@ -546,6 +815,19 @@ def get_local_ips() -> list:
     return ips, subnets
 
 
+def bind_listen_socket(port: int) -> socket.socket:
+    """Bind and listen on 0.0.0.0:port - the socket is handed to uvicorn instead of a host/port"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    try:
+        sock.bind(('0.0.0.0', port))
+        sock.listen(2048)  # uvicorn's default backlog
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
 def check_port_available(port: int) -> bool:
     """Check if a port is available (with SO_REUSEADDR for TIME_WAIT sockets)"""
     try:
@@ -585,156 +867,484 @@ def kill_existing_dashboard():
 # BITCOIN RPC
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def get_peer_info() -> list:
+RPC_TIMEOUT = 30
+RPC_DEFAULT_PORTS = {'main': 8332, 'test': 18332, 'signet': 38332, 'regtest': 18443}
+RPC_NET_SUBDIRS = {'main': '', 'test': 'testnet3', 'signet': 'signet', 'regtest': 'regtest'}
+RPC_SETTINGS_RETRY = 10  # Seconds a failed credential lookup is reused before conf/cookie are read again
+
+
+class RPCError(Exception):
+    """bitcoind answered the call with an error"""
+
+
+class RPCUnavailable(Exception):
+    """No usable HTTP endpoint/credentials - caller falls back to bitcoin-cli"""
+
+
+def read_bitcoin_conf(path: Path, network: str) -> dict:
+    """Parse bitcoin.conf; keys in the [network] section override global ones"""
+    global_vals, net_vals = {}, {}
+    section = None
     try:
-        cmd = config.get_cli_command() + ['getpeerinfo']
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-        if result.returncode == 0:
-            return json.loads(result.stdout)
-    except:
+        with open(path, 'r') as f:
+            for line in f:
+                line = line.split('#', 1)[0].strip()
+                if line.startswith('[') and line.endswith(']'):
+                    section = line[1:-1].strip()
+                    continue
+                if '=' not in line:
+                    continue
+                key, value = (part.strip() for part in line.split('=', 1))
+                if '.' in key:
+                    section_prefix, key = key.split('.', 1)
+                    if section_prefix == network:
+                        net_vals[key] = value
+                elif section is None:
+                    global_vals[key] = value
+                elif section == network:
+                    net_vals[key] = value
+    except OSError:
+        pass
+    global_vals.update(net_vals)
+    return global_vals
+
+
+class BitcoinRPC:
+    """JSON-RPC over HTTP to bitcoind, reusing keep-alive connections.
+
+    Endpoint and credentials come from config.conf (MBTC_RPC_*) and
+    bitcoin.conf, falling back to the .cookie file in the network datadir.
+    """
+
+    def __init__(self, cfg: 'Config'):
+        self.cfg = cfg
+        self.url = None
+        self.auth = None
+        self._local = threading.local()
+        self._settings_lock = threading.Lock()
+        self._settings_failed_at = None  # Monotonic time of the last lookup that found no credentials
+
+    def _session(self) -> requests.Session:
+        # requests.Session isn't guaranteed thread-safe: one pool per thread
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers['Content-Type'] = 'application/json'
+            self._local.session = session
+        return session
+
+    def load_settings(self) -> bool:
+        cfg = self.cfg
+        network = cfg.network if cfg.network in RPC_DEFAULT_PORTS else 'main'
+        datadir = Path(cfg.datadir).expanduser() if cfg.datadir else Path.home() / '.bitcoin'
+        net_dir = datadir / RPC_NET_SUBDIRS[network]
+        conf_path = Path(cfg.conf).expanduser() if cfg.conf else datadir / 'bitcoin.conf'
+        conf = read_bitcoin_conf(conf_path, network)
+
+        # rpcconnect may carry its own port (host:port / [v6]:port); rpcport still wins, as in bitcoin-cli
+        host, host_port = split_addr(cfg.get('MBTC_RPC_HOST') or conf.get('rpcconnect') or '127.0.0.1')
+        if host in ('0.0.0.0', '::', ''):
+            host = '127.0.0.1'
+        port = cfg.get('MBTC_RPC_PORT') or conf.get('rpcport') or host_port or RPC_DEFAULT_PORTS[network]
+        if ':' in host and not host.startswith('['):
+            host = f"[{host}]"
+
+        auth = None
+        if conf.get('rpcuser') and conf.get('rpcpassword'):
+            auth = (conf['rpcuser'], conf['rpcpassword'])
+        else:
+            cookie = cfg.get('MBTC_COOKIE_PATH') or conf.get('rpccookiefile') or '.cookie'
+            cookie_path = Path(cookie).expanduser()
+            if not cookie_path.is_absolute():
+                cookie_path = net_dir / cookie_path
+            try:
+                user, _, password = cookie_path.read_text().strip().partition(':')
+                if password:
+                    auth = (user, password)
+            except OSError:
+                pass
+
+        with self._settings_lock:
+            self.url = f"http://{host}:{port}/" if auth else None
+            self.auth = auth
+            self._settings_failed_at = None if auth else time.monotonic()
+        return auth is not None
+
+    def _settings_missing(self) -> bool:
+        """True when there are no credentials, re-reading conf/cookie at most every RPC_SETTINGS_RETRY"""
+        if self.url is not None:
+            return False
+        failed_at = self._settings_failed_at
+        if failed_at is not None and time.monotonic() - failed_at < RPC_SETTINGS_RETRY:
+            return True  # bitcoin-cli fallback without re-reading the same missing files every call
+        return not self.load_settings()
+
+    def _post(self, payload: bytes, timeout: float):
+        """POST a JSON-RPC payload and return the decoded body"""
+        if self._settings_missing():
+            raise RPCUnavailable("no RPC credentials")
+        try:
+            resp = self._session().post(self.url, data=payload, auth=self.auth, timeout=timeout)
+            if resp.status_code == 401:
+                # Cookie rotates on every bitcoind restart
+                if not self.load_settings():
+                    raise RPCUnavailable("no RPC credentials")
+                resp = self._session().post(self.url, data=payload, auth=self.auth, timeout=timeout)
+        except requests.RequestException as e:
+            raise RPCUnavailable(str(e))
+        if resp.status_code in (401, 403):
+            raise RPCUnavailable(f"HTTP {resp.status_code}")
+        try:
+            return orjson.loads(resp.content)
+        except orjson.JSONDecodeError:
+            raise RPCUnavailable(f"HTTP {resp.status_code}")
+
+    @staticmethod
+    def _result(body: dict):
+        if not isinstance(body, dict):
+            return RPCError(f"malformed response: {str(body)[:80]}")
+        error = body.get('error')
+        if error:
+            return RPCError(error.get('message', str(error)) if isinstance(error, dict) else str(error))
+        return body.get('result')
+
+    def call(self, method: str, *params, timeout: float = RPC_TIMEOUT):
+        payload = orjson.dumps({'jsonrpc': '1.0', 'id': method, 'method': method, 'params': params})
+        result = self._result(self._post(payload, timeout))
+        if isinstance(result, RPCError):
+            raise result
+        return result
+
+    def call_batch(self, calls: list, timeout: float = RPC_TIMEOUT) -> list:
+        """Send (method, *params) tuples as one JSON-RPC batch; each slot is a result or an RPCError"""
+        payload = orjson.dumps([{'jsonrpc': '1.0', 'id': i, 'method': method, 'params': params}
+                                for i, (method, *params) in enumerate(calls)])
+        bodies = self._post(payload, timeout)
+        if not isinstance(bodies, list):
+            # Whole batch rejected (e.g. a node that predates batch support) - same error for every slot
+            return [self._result(bodies) or RPCError("batch rejected")] * len(calls)
+        results = [RPCError("no response")] * len(calls)
+        for body in bodies:
+            if isinstance(body, dict) and isinstance(body.get('id'), int) and 0 <= body['id'] < len(calls):
+                results[body['id']] = self._result(body)
+        return results
+
+
+bitcoin_rpc: Optional[BitcoinRPC] = None
+
+
+@functools.lru_cache(maxsize=8)
+def resolve_executable(name: str) -> str:
+    """Absolute path of an executable on PATH (name unchanged if it isn't found)"""
+    return shutil.which(name) or name
+
+
+def rpc_call(method: str, *params, timeout: float = RPC_TIMEOUT):
+    """Call a bitcoind RPC over HTTP, falling back to bitcoin-cli when HTTP is unusable"""
+    global bitcoin_rpc
+    if bitcoin_rpc is None:
+        bitcoin_rpc = BitcoinRPC(config)
+    try:
+        return bitcoin_rpc.call(method, *params, timeout=timeout)
+    except RPCUnavailable:
+        pass
+    args = [p if isinstance(p, str) else orjson.dumps(p).decode() for p in params]
+    cmd = config.get_cli_command()
+    cmd[0] = resolve_executable(cmd[0])
+    # Raw bytes straight into orjson - no text decode pass over large outputs like getpeerinfo.
+    # The absolute path skips the child's PATH search (and is one of subprocess's posix_spawn conditions)
+    result = subprocess.run(cmd + [method] + args, capture_output=True, timeout=timeout)
+    if result.returncode != 0:
+        raise RPCError(result.stderr.decode(errors='replace').strip() or f"{method} failed")
+    out = result.stdout.strip()
+    try:
+        return orjson.loads(out) if out else None
+    except orjson.JSONDecodeError:
+        return out.decode(errors='replace')  # Plain-text results (e.g. getbestblockhash)
+
+
+def rpc_batch(calls: list, timeout: float = RPC_TIMEOUT) -> list:
+    """Several RPCs in one HTTP round trip; each slot is a result or the exception that call raised"""
+    global bitcoin_rpc
+    if bitcoin_rpc is None:
+        bitcoin_rpc = BitcoinRPC(config)
+    try:
+        return bitcoin_rpc.call_batch(calls, timeout=timeout)
+    except RPCUnavailable:
         pass
-    return []
+    # bitcoin-cli has no batch mode - one call each
+    results = []
+    for method, *params in calls:
+        try:
+            results.append(rpc_call(method, *params, timeout=timeout))
+        except Exception as e:
+            results.append(e)
+    return results
+
+
+def rpc_result(value):
+    """Unwrap one rpc_batch() slot, raising the exception it holds"""
+    if isinstance(value, BaseException):
+        raise value
+    return value
+
+
+async def rpc_call_async(method: str, *params, timeout: float = RPC_TIMEOUT):
+    """rpc_call() on a worker thread, so async routes never block the event loop on bitcoind"""
+    return await asyncio.to_thread(rpc_call, method, *params, timeout=timeout)
+
+
+# getpeerinfo keys the dashboard reads - each entry carries ~40, most of them per-message counters
+PEER_INFO_FIELDS = ('id', 'addr', 'network', 'inbound', 'subver', 'bytessent', 'bytesrecv', 'pingtime',
+                    'conntime', 'version', 'connection_type', 'servicesnames')
+
+
+def get_peer_info() -> list:
+    """getpeerinfo trimmed to PEER_INFO_FIELDS, so the parsed RPC result is dropped as soon as it's read"""
+    try:
+        raw = rpc_call('getpeerinfo') or []
+    except Exception:
+        return []
+    return [{k: peer[k] for k in PEER_INFO_FIELDS if k in peer} for peer in raw]
 
 
 def get_enabled_networks() -> list:
     """Get list of enabled/reachable networks from getnetworkinfo"""
     enabled = []
     try:
-        cmd = config.get_cli_command() + ['getnetworkinfo']
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-        if result.returncode == 0:
-            info = json.loads(result.stdout)
-            for net in info.get('networks', []):
-                if net.get('reachable', False):
-                    enabled.append(net.get('name', ''))
-    except:
+        info = rpc_call('getnetworkinfo')
+        for net in info.get('networks', []):
+            if net.get('reachable', False):
+                enabled.append(net.get('name', ''))
+    except Exception:
         pass
     # Return at least ipv4 as default
     return enabled if enabled else ['ipv4']
 
 
+ENABLED_NETWORKS_TTL = 60  # Seconds /api/stats reuses the reachable-network list
+_enabled_networks_cache = (0.0, [])
+
+
+NODE_INFO_TTL = 2  # Seconds concurrent /api/info requests share one RPC batch
+_node_info_cache = (0.0, None)
+_node_info_lock = threading.Lock()
+
+
+def get_node_info() -> list:
+    """[header, getblockchaininfo, getindexinfo, getnetworkinfo, getmempoolinfo] as rpc_batch() slots.
+
+    One JSON-RPC batch, plus the header, which needs the best hash first.
+    """
+    results = rpc_batch([('getbestblockhash',), ('getblockchaininfo',), ('getindexinfo',),
+                         ('getnetworkinfo',), ('getmempoolinfo',)], timeout=10)
+    try:
+        results[0] = rpc_call('getblockheader', rpc_result(results[0]), timeout=10)
+    except Exception as e:
+        results[0] = e
+    return results
+
+
+def get_node_info_cached() -> list:
+    """get_node_info(), fetched at most once per NODE_INFO_TTL however many clients ask"""
+    global _node_info_cache
+    with _node_info_lock:
+        fetched_at, results = _node_info_cache
+        if results is None or time.time() - fetched_at > NODE_INFO_TTL:
+            results = get_node_info()
+            _node_info_cache = (time.time(), results)
+    return results
+
+
+def get_enabled_networks_cached() -> list:
+    """get_enabled_networks(), re-queried at most once per ENABLED_NETWORKS_TTL"""
+    global _enabled_networks_cache
+    fetched_at, networks = _enabled_networks_cache
+    if time.time() - fetched_at > ENABLED_NETWORKS_TTL:
+        networks = get_enabled_networks()
+        _enabled_networks_cache = (time.time(), networks)
+    return networks
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # GEO LOOKUP
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def fetch_geo_api(ip: str) -> Optional[dict]:
+_http_local = threading.local()
+
+
+def http_session() -> requests.Session:
+    """Keep-alive session for outbound HTTP (ip-api, Coinbase, geo.db download) - one per thread,
+    so repeat calls skip the TCP (and for HTTPS, TLS) handshake"""
+    session = getattr(_http_local, 'session', None)
+    if session is None:
+        session = _http_local.session = requests.Session()
+    return session
+
+
+def fetch_geo_api_batch(ips: list) -> Optional[dict]:
+    """Look up to GEO_API_BATCH_SIZE IPs in one POST; returns {ip: data} for the successful ones,
+    or None if the request itself failed (nothing was learned about the IPs)"""
+    results = {}
     try:
-        url = f"{GEO_API_URL}/{ip}?fields={GEO_API_FIELDS}"
-        response = requests.get(url, timeout=10)
-        data = response.json()
-        if data.get('status') == 'success':
-            return data
+        response = http_session().post(f"{GEO_API_BATCH_URL}?fields={GEO_API_FIELDS}", json=ips, timeout=15)
+        if response.status_code != 200:
+            return None  # Rate limited or ip-api trouble - not an answer about these IPs
+        # Responses come back in request order
+        for ip, data in zip(ips, orjson.loads(response.content)):
+            if isinstance(data, dict) and data.get('status') == 'success':
+                results[ip] = data
     except:
-        pass
-    return None
+        return None
+    return results
 
 
-def geo_worker():
-    """Background thread for geo lookups - checks DB first, then API, stores in both"""
-    global geo_pending_count
-    while not stop_flag.is_set():
-        try:
-            ip, network_type = geo_queue.get(timeout=0.5)
-        except queue.Empty:
-            continue
+def geo_entry_from_data(data: dict, from_db: bool) -> dict:
+    """SESSION CACHE entry from an ip-api response or a geo.db row (the DB stores offset/as as utc_offset/as_info)"""
+    return {
+        'status': 'ok',
+        'continent': data.get('continent', ''),
+        'continentCode': data.get('continentCode', ''),
+        'country': data.get('country', ''),
+        'countryCode': data.get('countryCode', ''),
+        'region': data.get('region', ''),
+        'regionName': data.get('regionName', ''),
+        'city': data.get('city', ''),
+        'district': data.get('district', ''),
+        'zip': data.get('zip', ''),
+        'lat': data.get('lat', 0),
+        'lon': data.get('lon', 0),
+        'timezone': data.get('timezone', ''),
+        'offset': data.get('utc_offset') if from_db else data.get('offset', 0),
+        'currency': data.get('currency', ''),
+        'isp': data.get('isp', ''),
+        'org': data.get('org', ''),
+        'as': data.get('as_info') if from_db else data.get('as', ''),
+        'asname': data.get('asname', ''),
+        'mobile': data.get('mobile', False),
+        'proxy': data.get('proxy', False),
+        'hosting': data.get('hosting', False),
+    }
 
-        data = None
-        from_db = False
 
-        # First check the geo database
-        db_data = get_geo_from_db(ip)
-        if db_data:
-            data = db_data
-            from_db = True
-        else:
-            # Not in database, call the API
-            data = fetch_geo_api(ip)
-            if data:
-                # Save to database for future lookups
-                save_geo_to_db(ip, data)
+def geo_worker():
+    """Background thread for geo lookups - drains the queue in batches, checks DB first, then API, stores in both"""
+    outage_delay = 0  # Current back-off while ip-api requests fail outright (0 = healthy)
+    while True:
+        with geo_pending_cv:
+            # Sleep until there is work or stop_background_workers() - no periodic polling
+            while not geo_pending and not stop_flag.is_set():
+                geo_pending_cv.wait()
+            if stop_flag.is_set():
+                return
+            # Peek, don't pop - the batch stays pending (and deduped) until it is resolved
+            batch = list(itertools.islice(geo_pending, GEO_API_BATCH_SIZE))
+
+        # First check the geo database, then one API call for whatever it doesn't have
+        entries = {ip: geo_entry_from_data(row, from_db=True) for ip, row in get_geo_many_from_db(batch).items()}
+        misses = [ip for ip in batch if ip not in entries]
+        if misses:
+            api_data = fetch_geo_api_batch(misses)
+            failed = []
+            for ip in misses:
+                data = api_data.get(ip) if api_data is not None else None
+                if data:
+                    entries[ip] = geo_entry_from_data(data, from_db=False)
+                else:
+                    entries[ip] = dict(_EMPTY_GEO, status='unavailable')
+                    failed.append(ip)
+            # Save to database for future lookups
+            if api_data:
+                save_geo_many_to_db(api_data)
+            # A failed request says nothing about the IPs (no per-IP backoff) - the endpoint backs off below
+            if api_data is not None and failed:
+                record_geo_failures(failed)
+        with geo_retry_lock:
+            for ip in entries:
+                if entries[ip]['status'] == 'ok':
+                    geo_retry.pop(ip, None)
 
         # Store in SESSION CACHE (fast in-memory lookup)
         with geo_cache_lock:
-            if data:
-                geo_cache[ip] = {
-                    'status': 'ok',
-                    'continent': data.get('continent', ''),
-                    'continentCode': data.get('continentCode', ''),
-                    'country': data.get('country', ''),
-                    'countryCode': data.get('countryCode', ''),
-                    'region': data.get('region', ''),
-                    'regionName': data.get('regionName', ''),
-                    'city': data.get('city', ''),
-                    'district': data.get('district', ''),
-                    'zip': data.get('zip', ''),
-                    'lat': data.get('lat', 0),
-                    'lon': data.get('lon', 0),
-                    'timezone': data.get('timezone', ''),
-                    'offset': data.get('utc_offset') if from_db else data.get('offset', 0),
-                    'currency': data.get('currency', ''),
-                    'isp': data.get('isp', ''),
-                    'org': data.get('org', ''),
-                    'as': data.get('as_info') if from_db else data.get('as', ''),
-                    'asname': data.get('asname', ''),
-                    'mobile': data.get('mobile', False),
-                    'proxy': data.get('proxy', False),
-                    'hosting': data.get('hosting', False),
-                }
+            geo_cache.update(entries)
+
+        with geo_pending_cv:
+            for ip in batch:
+                geo_pending.pop(ip, None)
+
+        broadcast_update('geo_update', {'ips': batch})
+        prerender_peers_body()
+
+        # Only delay if we called the API (not when everything came from the DB). While ip-api is down
+        # the wait doubles, so an outage costs one request per back-off step instead of one per refresh;
+        # the IPs are re-queued by refresh_worker meanwhile and go out in the next batch
+        if misses:
+            if api_data is None:
+                outage_delay = min(outage_delay * 2, GEO_API_OUTAGE_DELAY_MAX) if outage_delay else GEO_API_OUTAGE_DELAY
+                stop_flag.wait(outage_delay)
             else:
-                geo_cache[ip] = {
-                    'status': 'unavailable',
-                    'continent': '', 'continentCode': '',
-                    'country': '', 'countryCode': '',
-                    'region': '', 'regionName': '',
-                    'city': '', 'district': '', 'zip': '',
-                    'lat': 0, 'lon': 0,
-                    'timezone': '', 'offset': 0, 'currency': '',
-                    'isp': '', 'org': '', 'as': '', 'asname': '',
-                    'mobile': False, 'proxy': False, 'hosting': False,
-                }
-
-        with pending_lock:
-            pending_lookups.discard(ip)
-
-        # Update pending count
-        with geo_pending_lock:
-            geo_pending_count = len(pending_lookups)
-
-        broadcast_update('geo_update', {'ip': ip})
-
-        # Only delay if we called the API (not when loading from DB)
-        if not from_db:
-            time.sleep(GEO_API_DELAY)
-
-
-def get_cached_geo(ip: str) -> dict:
-    """Get geo from SESSION CACHE (instant, no DB)"""
-    with geo_cache_lock:
-        return geo_cache.get(ip)
+                outage_delay = 0
+                stop_flag.wait(GEO_API_BATCH_DELAY)
+
+
+def stop_background_workers():
+    """Set stop_flag and wake any worker blocked waiting for work"""
+    stop_flag.set()
+    with geo_pending_cv:
+        geo_pending_cv.notify_all()
+
 
+def record_geo_failures(ips: list):
+    """Count an ip-api failure for each IP, starting (or extending) its retry backoff"""
+    now = time.time()
+    with geo_retry_lock:
+        for ip in ips:
+            failures = geo_retry.get(ip, (0, 0))[0]
+            geo_retry[ip] = [failures + 1, now]
 
-def set_cached_geo_private(ip: str):
-    """Mark IP as private in session cache"""
+
+def geo_retry_backing_off(ips, now: float) -> set:
+    """IPs whose last ip-api failure is more recent than their RETRY_INTERVALS step"""
+    with geo_retry_lock:
+        return {ip for ip in ips if ip in geo_retry and
+                now - geo_retry[ip][1] < RETRY_INTERVALS[min(geo_retry[ip][0], len(RETRY_INTERVALS)) - 1]}
+
+
+def load_geo_retry():
+    """Seed geo_retry from the file saved by the last run"""
+    global geo_retry
+    try:
+        saved = orjson.loads(GEO_RETRY_FILE.read_bytes())
+    except Exception:
+        return
+    with geo_retry_lock:
+        geo_retry = saved
+
+
+def save_geo_retry():
+    """Write geo_retry, dropping entries whose longest backoff has long passed"""
+    cutoff = time.time() - RETRY_INTERVALS[-1]
+    with geo_retry_lock:
+        snapshot = {ip: entry for ip, entry in geo_retry.items() if entry[1] > cutoff}
+    try:
+        GEO_RETRY_FILE.write_bytes(orjson.dumps(snapshot))
+    except Exception as e:
+        print(f"Warning: Could not save geo retry state: {e}")
+
+
+def set_cached_geo_private(ips):
+    """Mark IPs as private in session cache (one lock acquisition for the whole batch)"""
     with geo_cache_lock:
-        geo_cache[ip] = {
-            'status': 'private',
-            'continent': '', 'continentCode': '',
-            'country': '', 'countryCode': '',
-            'region': '', 'regionName': '',
-            'city': '', 'district': '', 'zip': '',
-            'lat': 0, 'lon': 0,
-            'timezone': '', 'offset': 0, 'currency': '',
-            'isp': '', 'org': '', 'as': '', 'asname': '',
-            'mobile': False, 'proxy': False, 'hosting': False,
-        }
+        for ip in ips:
+            geo_cache[ip] = dict(_EMPTY_GEO, status='private')
 
 
 def queue_geo_lookup(ip: str, network_type: str):
-    with pending_lock:
-        if ip in pending_lookups:
+    with geo_pending_cv:
+        if ip in geo_pending:
             return
-        pending_lookups.add(ip)
-    geo_queue.put((ip, network_type))
+        geo_pending[ip] = network_type
+        geo_pending_cv.notify()
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -743,15 +1353,17 @@ def queue_geo_lookup(ip: str, network_type: str):
 
 def refresh_worker():
     """Background thread for periodic data refresh - uses SESSION CACHE"""
-    global current_peers, recent_changes, geo_pending_count
+    global current_peers, current_peers_by_id
     previous_ids = set()
     addrman_refresh_counter = 0
 
     while not stop_flag.is_set():
         peers = get_peer_info()
+        peers_by_id = {peer.get('id'): peer for peer in peers}
 
         with peers_lock:
             current_peers = peers
+            current_peers_by_id = peers_by_id
 
         # Refresh addrman cache every 6 cycles (60 seconds)
         addrman_refresh_counter += 1
@@ -759,36 +1371,76 @@ def refresh_worker():
             refresh_addrman_cache()
             addrman_refresh_counter = 0
 
-        # Track changes
+        # Track changes - collected per cycle, then applied with one lock acquisition each
         current_ids = set()
         now = time.time()
+        peer_ips = {}
+        connected = []
 
         for peer in peers:
             peer_id = str(peer.get('id', ''))
             current_ids.add(peer_id)
             addr = peer.get('addr', '')
-            network_type = peer.get('network', get_network_type(addr))
-            ip = extract_ip(addr)
-            port = extract_port(addr)
+            network_type = peer['network'] if 'network' in peer else get_network_type(addr)
+            ip, port = split_addr(addr)
 
             # Track peer ID -> IP mapping (so we have IP when they disconnect)
-            with peer_ip_map_lock:
-                peer_ip_map[peer_id] = {'ip': ip, 'port': port, 'network': network_type}
+            peer_ips[peer_id] = {'ip': ip, 'port': port, 'network': network_type}
 
             # New peer connected (or first run)
             if peer_id not in previous_ids:
                 if previous_ids:  # Only add to changes after first run
-                    with changes_lock:
-                        recent_changes.append((now, 'connected', {'ip': ip, 'port': port, 'network': network_type}))
+                    connected.append((now, 'connected', {'ip': ip, 'port': port, 'network': network_type}))
+
+        with peer_ip_map_lock:
+            peer_ip_map.update(peer_ips)
+
+        # Keep the session cache bounded on long runs: a returning peer is one geo.db read away
+        with geo_cache_lock:
+            if len(geo_cache) > GEO_CACHE_MAX:
+                live_ips = {info['ip'] for info in peer_ips.values()}
+                for ip in [ip for ip in geo_cache if ip not in live_ips]:
+                    del geo_cache[ip]
+        if connected:
+            with changes_lock:
+                recent_changes.extend(connected)
 
-            # Queue geo lookup if not already cached
-            cached = get_cached_geo(ip)
-            if cached is None:
-                if is_public_address(network_type, ip):
+        # Geo for IPs not already cached (or whose lookup failed): private IPs are marked in one batch,
+        # public ones are resolved from geo.db in one query and only the misses are queued for the API
+        with geo_cache_lock:
+            uncached = {info['ip']: info['network'] for info in peer_ips.values()
+                        if info['ip'] not in geo_cache or geo_cache[info['ip']]['status'] == 'unavailable'}
+        private_ips = []
+        public = {}
+        for ip, network_type in uncached.items():
+            if is_public_address(network_type, ip):
+                public[ip] = network_type
+            else:
+                private_ips.append(ip)
+        if private_ips:
+            set_cached_geo_private(private_ips)
+        # ip-api already failed on these - leave them unavailable until their RETRY_INTERVALS step passes
+        backing_off = geo_retry_backing_off(public, now)
+        if backing_off:
+            with geo_cache_lock:
+                for ip in backing_off:
+                    geo_cache.setdefault(ip, dict(_EMPTY_GEO, status='unavailable'))
+                    del public[ip]
+        # Already queued - geo_worker checks geo.db itself before asking the API, no need to re-read here
+        if public:
+            with geo_pending_cv:
+                queued = [ip for ip in public if ip in geo_pending]
+            for ip in queued:
+                del public[ip]
+        if public:
+            db_rows = get_geo_many_from_db(list(public))
+            if db_rows:
+                with geo_cache_lock:
+                    for ip, row in db_rows.items():
+                        geo_cache[ip] = geo_entry_from_data(row, from_db=True)
+            for ip, network_type in public.items():
+                if ip not in db_rows:
                     queue_geo_lookup(ip, network_type)
-                else:
-                    # Private IP - mark as private in session cache
-                    set_cached_geo_private(ip)
 
         # Handle disconnected peers - NOW WITH IP!
         # Use pop() to remove the entry after reading (prevents memory leak)
@@ -801,47 +1453,141 @@ def refresh_worker():
             with changes_lock:
                 recent_changes.append((now, 'disconnected', {'ip': ip, 'port': port, 'network': network}))
 
-        # Update pending count
-        with geo_pending_lock:
-            geo_pending_count = len(pending_lookups)
-
-        # Prune old changes
+        # Prune old changes - entries are appended in time order, so expire from the head
         with changes_lock:
-            recent_changes = [(t, c, p) for t, c, p in recent_changes if now - t < RECENT_WINDOW]
+            while recent_changes and now - recent_changes[0][0] >= RECENT_WINDOW:
+                recent_changes.popleft()
 
         previous_ids = current_ids
 
-        # Broadcast update
+        # Broadcast update (the coalescing window gives the prerender time to land first)
         broadcast_update('peers_update', {})
+        prerender_peers_body()
 
-        time.sleep(REFRESH_INTERVAL)
+        stop_flag.wait(REFRESH_INTERVAL)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # WEBSOCKET
 # ═══════════════════════════════════════════════════════════════════════════════
 
+def _fan_out_sse(payload):
+    """Queue a payload for every SSE client (runs on the server loop)"""
+    for client_queue in list(sse_subscribers):
+        try:
+            client_queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            if payload is not None:
+                continue  # Client is not keeping up - it still gets the next event
+            # The shutdown wake must not be lost: make room by dropping the oldest queued event
+            try:
+                client_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+            client_queue.put_nowait(None)
+
+
+def publish_sse(payload):
+    """Hand a payload to all SSE clients from any thread (asyncio queues are not thread-safe)"""
+    if sse_loop is None:
+        return  # No SSE client has connected yet
+    try:
+        sse_loop.call_soon_threadsafe(_fan_out_sse, payload)
+    except RuntimeError:
+        pass  # Loop already closed during shutdown
+
+
+def wake_sse_clients():
+    """Wake every SSE generator so it notices shutdown (None = no message, re-check stop_flag)"""
+    publish_sse(None)
+
+
+# Broadcasts within this window go out as one SSE event (a burst of geo results = one refetch)
+SSE_COALESCE_WINDOW = 0.25
+_pending_broadcast_types = set()
+_broadcast_scheduled = False  # A flush is queued on the SSE loop for the current window
+_broadcast_lock = threading.Lock()
+
+
+def _flush_broadcast():
+    """Send one SSE event for everything broadcast during the window (peers_update covers geo_update).
+    Runs on the SSE loop, so it fans out directly."""
+    global _broadcast_scheduled
+    with _broadcast_lock:
+        types = set(_pending_broadcast_types)
+        _pending_broadcast_types.clear()
+        _broadcast_scheduled = False
+    if types:
+        event_type = 'peers_update' if 'peers_update' in types else types.pop()
+        _fan_out_sse(orjson.dumps({"type": event_type}).decode())
+
+
 def broadcast_update(event_type: str, data: dict):
-    """Signal SSE clients of update"""
-    global last_update_type
-    last_update_type = event_type
-    sse_update_event.set()
+    """Signal SSE clients of update (coalesced over SSE_COALESCE_WINDOW)"""
+    global peers_generation, _broadcast_scheduled
+    with peers_generation_lock:
+        peers_generation += 1
+    if sse_loop is None:
+        return  # No SSE client has connected yet - the generation bump is all that matters
+    with _broadcast_lock:
+        _pending_broadcast_types.add(event_type)
+        if not _broadcast_scheduled:
+            try:
+                sse_loop.call_soon_threadsafe(sse_loop.call_later, SSE_COALESCE_WINDOW, _flush_broadcast)
+                _broadcast_scheduled = True
+            except RuntimeError:
+                pass  # Loop already closed during shutdown
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # HELPERS
 # ═══════════════════════════════════════════════════════════════════════════════
 
+# (divisor, format) per 1024x tier - indexed by bit_length so picking the unit is one lookup
+_BYTE_TIERS = (
+    (1, "{:.0f}B"),
+    (1024, "{:.1f}KB"),
+    (1024 ** 2, "{:.1f}MB"),
+    (1024 ** 3, "{:.2f}GB"),
+)
+
+
+@functools.lru_cache(maxsize=4096)
 def format_bytes(b: int) -> str:
-    """Format bytes to human readable string"""
+    """Format bytes to human readable string (cached - idle peers repeat the same counters every poll)"""
     if b < 1024:
         return f"{b}B"
-    elif b < 1024 * 1024:
-        return f"{b / 1024:.1f}KB"
-    elif b < 1024 * 1024 * 1024:
-        return f"{b / (1024 * 1024):.1f}MB"
-    else:
-        return f"{b / (1024 * 1024 * 1024):.2f}GB"
+    divisor, fmt = _BYTE_TIERS[min((int(b).bit_length() - 1) // 10, 3)]
+    return fmt.format(b / divisor)
+
+
+def format_conntime(elapsed: int) -> str:
+    """Format elapsed seconds as the two most significant non-zero units (e.g. 1d3h, 5m12s)"""
+    days, rem = divmod(elapsed, 86400)
+    hours, rem = divmod(rem, 3600)
+    minutes, seconds = divmod(rem, 60)
+    parts = [f"{v}{u}" for u, v in (('d', days), ('h', hours), ('m', minutes), ('s', seconds)) if v]
+    return ''.join(parts[:2]) or "0s"
+
+
+# Seconds a Coinbase spot price is reused - under the UI's 5s minimum price interval, so it only
+# collapses concurrent fetches (several tabs, info panel + mempool overlay) and never delays an update
+PRICE_CACHE_TTL = 4
+_price_cache = {}  # currency -> (fetched_at, price); only currencies Coinbase answered for get in
+
+
+def fetch_btc_price(currency: str) -> Optional[str]:
+    """BTC spot price from Coinbase as its decimal string (None if Coinbase didn't return one)"""
+    cached = _price_cache.get(currency)
+    if cached and time.time() - cached[0] < PRICE_CACHE_TTL:
+        return cached[1]
+    response = http_session().get(f"https://api.coinbase.com/v2/prices/BTC-{currency}/spot", timeout=5)
+    if response.status_code != 200:
+        return None
+    price = orjson.loads(response.content).get('data', {}).get('amount')
+    if price:
+        _price_cache[currency] = (time.time(), price)
+    return price
 
 
 # Connection type abbreviations
@@ -856,147 +1602,170 @@ CONNECTION_TYPE_ABBREV = {
 
 def abbrev_connection_type(conn_type: str) -> str:
     """Abbreviate connection type for compact display"""
-    return CONNECTION_TYPE_ABBREV.get(conn_type, conn_type[:3].upper() if conn_type else '-')
+    # Fallback only built for unknown types (the default argument would be evaluated on every call)
+    return CONNECTION_TYPE_ABBREV.get(conn_type) or (conn_type[:3].upper() if conn_type else '-')
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # API ROUTES
 # ═══════════════════════════════════════════════════════════════════════════════
 
-@app.get("/api/peers")
-async def api_peers():
-    """Get all current peers with full data - uses SESSION CACHE (no DB queries!)"""
+# Row layout for /api/peers - copied per peer so every row starts from the same defaults
+_PEER_ROW_TEMPLATE = {
+    # 1-6: getpeerinfo (instant)
+    'id': None, 'network': '', 'ip': '', 'port': '', 'direction': '', 'subver': '',
+
+    # 7-13: ip-api geo (loads second)
+    'city': '', 'region': '', 'regionName': '', 'country': '', 'countryCode': '',
+    'continent': '', 'continentCode': '',
+
+    # 14-20: more getpeerinfo
+    'bytessent': 0, 'bytesrecv': 0, 'bytessent_fmt': '', 'bytesrecv_fmt': '',
+    'ping_ms': 0, 'conntime': 0, 'conntime_fmt': '-', 'version': 0,
+    'connection_type': '', 'connection_type_abbrev': '', 'services': [], 'services_abbrev': '',
+
+    # 21-23: more ip-api
+    'lat': 0, 'lon': 0, 'isp': '',
+
+    # New geo columns (from expanded API)
+    'district': '', 'zip': '', 'timezone': '', 'offset': 0, 'currency': '',
+    'org': '', 'as': '', 'asname': '', 'mobile': False, 'proxy': False, 'hosting': False,
+
+    # Addrman status
+    'in_addrman': False,
+
+    # Extra fields for UI
+    'location': '', 'location_status': '', 'addr': '',
+}
+
+# Geo columns copied from the session cache into each peer row
+PEER_GEO_FIELDS = (
+    'city', 'region', 'regionName', 'country', 'countryCode', 'continent', 'continentCode',
+    'lat', 'lon', 'isp',
+    'district', 'zip', 'timezone', 'offset', 'currency', 'org', 'as', 'asname',
+    'mobile', 'proxy', 'hosting',
+)
+
+# Networks with no geolocatable IP - always shown as PRIVATE
+_PRIVATE_NETS = frozenset(('onion', 'i2p', 'cjdns'))
+
+
+def build_peer_row(peer: dict, geo_map: dict, addrman_snapshot: set, now: int) -> dict:
+    """Build one /api/peers row from a getpeerinfo entry.
+
+    Pure function of its inputs (no locks, no I/O): geo_map and addrman_snapshot are
+    snapshots of the session caches taken once per response.
+    """
+    addr = peer.get('addr', '')
+    network_type = peer['network'] if 'network' in peer else get_network_type(addr)
+    ip, port = split_addr(addr)
+
+    # Geo from the SESSION CACHE snapshot (instant - no DB!); not looked up yet reads as all-blank
+    geo = geo_map.get(ip) or _EMPTY_GEO
+    geo_status = geo['status']
+
+    # Determine location status
+    if network_type in _PRIVATE_NETS or is_private_ip(ip):
+        location_status, location = 'private', 'PRIVATE'
+    elif geo_status == 'ok' and geo['city']:
+        location_status, location = 'ok', f"{geo['city']}, {geo['countryCode']}"
+    elif geo_status == 'unavailable':
+        location_status, location = 'unavailable', 'UNAVAILABLE'
+    else:
+        location_status, location = 'pending', 'Stalking...'
+
+    # Services abbreviation
+    services = peer.get('servicesnames', [])
+    services_abbrev = ' '.join([s[0] if s else '' for s in services[:5]])
+
+    # Connection time formatted - two most significant non-zero units, no spaces
+    conntime = peer.get('conntime', 0)
+    conn_fmt = format_conntime(now - conntime) if conntime else "-"
+
+    # Build response with ALL 26 columns in specified order (template copy keeps key layout)
+    row = _PEER_ROW_TEMPLATE.copy()
+
+    # 1-6: getpeerinfo (instant)
+    row['id'] = peer.get('id')
+    row['network'] = network_type
+    row['ip'] = ip
+    row['port'] = port
+    row['direction'] = 'IN' if peer.get('inbound') else 'OUT'
+    row['subver'] = peer.get('subver', '').replace('/', '')
+
+    # 14-20: more getpeerinfo
+    bytessent = peer.get('bytessent', 0)
+    bytesrecv = peer.get('bytesrecv', 0)
+    connection_type = peer.get('connection_type', '')
+    row['bytessent'] = bytessent
+    row['bytesrecv'] = bytesrecv
+    row['bytessent_fmt'] = format_bytes(bytessent)
+    row['bytesrecv_fmt'] = format_bytes(bytesrecv)
+    row['ping_ms'] = int((peer.get('pingtime') or 0) * 1000)
+    row['conntime'] = conntime
+    row['conntime_fmt'] = conn_fmt
+    row['version'] = peer.get('version', 0)
+    row['connection_type'] = connection_type
+    row['connection_type_abbrev'] = abbrev_connection_type(connection_type)
+    row['services'] = services
+    row['services_abbrev'] = services_abbrev
+
+    # 7-13, 21-23 and expanded columns: ip-api geo (loads second)
+    for key in PEER_GEO_FIELDS:
+        row[key] = geo[key]
+
+    # Addrman status
+    row['in_addrman'] = ip in addrman_snapshot
+
+    # Extra fields for UI
+    row['location'] = location
+    row['location_status'] = location_status
+    row['addr'] = addr
+
+    return row
+
+
+def render_peers_body() -> bytes:
+    """Serialize the full /api/peers list from one snapshot of each cache"""
     with peers_lock:
-        peers_snapshot = list(current_peers)
+        peers_snapshot = current_peers
 
-    result = []
-    for peer in peers_snapshot:
-        addr = peer.get('addr', '')
-        network_type = peer.get('network', get_network_type(addr))
-        ip = extract_ip(addr)
-        port = extract_port(addr)
-
-        # Get geo from SESSION CACHE (instant - no DB!)
-        geo = get_cached_geo(ip)
-
-        # Determine location status
-        if network_type in ('onion', 'i2p', 'cjdns') or is_private_ip(ip):
-            location_status = 'private'
-            location = 'PRIVATE'
-        elif geo and geo.get('status') == 'ok' and geo.get('city'):
-            location_status = 'ok'
-            location = f"{geo['city']}, {geo.get('countryCode', '')}"
-        elif geo and geo.get('status') == 'unavailable':
-            location_status = 'unavailable'
-            location = 'UNAVAILABLE'
-        else:
-            location_status = 'pending'
-            location = 'Stalking...'
-
-        # Services abbreviation
-        services = peer.get('servicesnames', [])
-        services_abbrev = ' '.join([s[0] if s else '' for s in services[:5]])
-
-        # Connection time formatted - two most significant non-zero units, no spaces
-        conntime = peer.get('conntime', 0)
-        if conntime:
-            elapsed = int(time.time()) - conntime
-            days = elapsed // 86400
-            hours = (elapsed % 86400) // 3600
-            minutes = (elapsed % 3600) // 60
-            seconds = elapsed % 60
-
-            if days > 0:
-                # Days + next non-zero unit
-                if hours > 0:
-                    conn_fmt = f"{days}d{hours}h"
-                elif minutes > 0:
-                    conn_fmt = f"{days}d{minutes}m"
-                elif seconds > 0:
-                    conn_fmt = f"{days}d{seconds}s"
-                else:
-                    conn_fmt = f"{days}d"
-            elif hours > 0:
-                # Hours + next non-zero unit
-                if minutes > 0:
-                    conn_fmt = f"{hours}h{minutes}m"
-                elif seconds > 0:
-                    conn_fmt = f"{hours}h{seconds}s"
-                else:
-                    conn_fmt = f"{hours}h"
-            elif minutes > 0:
-                # Minutes + seconds
-                if seconds > 0:
-                    conn_fmt = f"{minutes}m{seconds}s"
-                else:
-                    conn_fmt = f"{minutes}m"
-            else:
-                # Just seconds
-                conn_fmt = f"{seconds}s"
-        else:
-            conn_fmt = "-"
-
-        # Build response with ALL 26 columns in specified order
-        result.append({
-            # 1-6: getpeerinfo (instant)
-            'id': peer.get('id'),
-            'network': network_type,
-            'ip': ip,
-            'port': port,
-            'direction': 'IN' if peer.get('inbound') else 'OUT',
-            'subver': peer.get('subver', '').replace('/', ''),
-
-            # 7-13: ip-api geo (loads second)
-            'city': geo.get('city', '') if geo else '',
-            'region': geo.get('region', '') if geo else '',
-            'regionName': geo.get('regionName', '') if geo else '',
-            'country': geo.get('country', '') if geo else '',
-            'countryCode': geo.get('countryCode', '') if geo else '',
-            'continent': geo.get('continent', '') if geo else '',
-            'continentCode': geo.get('continentCode', '') if geo else '',
-
-            # 14-20: more getpeerinfo
-            'bytessent': peer.get('bytessent', 0),
-            'bytesrecv': peer.get('bytesrecv', 0),
-            'bytessent_fmt': format_bytes(peer.get('bytessent', 0)),
-            'bytesrecv_fmt': format_bytes(peer.get('bytesrecv', 0)),
-            'ping_ms': int((peer.get('pingtime') or 0) * 1000),
-            'conntime': conntime,
-            'conntime_fmt': conn_fmt,
-            'version': peer.get('version', 0),
-            'connection_type': peer.get('connection_type', ''),
-            'connection_type_abbrev': abbrev_connection_type(peer.get('connection_type', '')),
-            'services': services,
-            'services_abbrev': services_abbrev,
-
-            # 21-23: more ip-api
-            'lat': geo.get('lat', 0) if geo else 0,
-            'lon': geo.get('lon', 0) if geo else 0,
-            'isp': geo.get('isp', '') if geo else '',
-
-            # New geo columns (from expanded API)
-            'district': geo.get('district', '') if geo else '',
-            'zip': geo.get('zip', '') if geo else '',
-            'timezone': geo.get('timezone', '') if geo else '',
-            'offset': geo.get('offset', 0) if geo else 0,
-            'currency': geo.get('currency', '') if geo else '',
-            'org': geo.get('org', '') if geo else '',
-            'as': geo.get('as', '') if geo else '',
-            'asname': geo.get('asname', '') if geo else '',
-            'mobile': geo.get('mobile', False) if geo else False,
-            'proxy': geo.get('proxy', False) if geo else False,
-            'hosting': geo.get('hosting', False) if geo else False,
-
-            # Addrman status
-            'in_addrman': is_in_addrman(ip),
-
-            # Extra fields for UI
-            'location': location,
-            'location_status': location_status,
-            'addr': addr,
-        })
+    # One shallow copy of the geo cache instead of a lock round-trip per peer
+    with geo_cache_lock:
+        geo_snapshot = dict(geo_cache)
 
-    return result
+    # Addrman set is replaced wholesale on refresh, so one reference covers the whole response
+    with addrman_cache_lock:
+        addrman_snapshot = addrman_cache
+
+    now = int(time.time())
+    return orjson.dumps([build_peer_row(peer, geo_snapshot, addrman_snapshot, now) for peer in peers_snapshot])
+
+
+def prerender_peers_body():
+    """Render /api/peers for the current generation on the calling worker thread, so the refetch
+    each broadcast triggers is served from cache instead of rendering on the event loop"""
+    global _peers_body_cache
+    generation = peers_generation
+    if _peers_body_cache[0] != generation:
+        _peers_body_cache = (generation, render_peers_body())
+
+
+@app.get("/api/peers")
+async def api_peers(request: Request):
+    """Get all current peers with full data (cached per update generation, ETag/304 aware)"""
+    global _peers_body_cache
+    generation = peers_generation  # Read before the snapshot so a concurrent update forces a rebuild
+    etag = f'"{PEERS_ETAG_BOOT_ID}-{generation}"'
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+    if request.headers.get('if-none-match') == etag:
+        return Response(status_code=304, headers=headers)
+
+    cached_generation, body = _peers_body_cache
+    if cached_generation != generation:
+        body = render_peers_body()
+        _peers_body_cache = (generation, body)
+    return Response(content=body, media_type='application/json', headers=headers)
 
 
 @app.get("/api/changes")
@@ -1004,15 +1773,20 @@ async def api_changes():
     """Get recent peer changes"""
     with changes_lock:
         changes = list(recent_changes)
-    return [{'time': t, 'type': c, 'peer': p} for t, c, p in changes]
+    return ORJSONResponse([{'time': t, 'type': c, 'peer': p} for t, c, p in changes])
 
 
 @app.get("/api/stats")
 async def api_stats():
     """Get dashboard statistics"""
-    # Get fresh peer info from RPC
-    peers = get_peer_info()
+    # Peers come from refresh_worker's snapshot - no RPC per poll
+    with peers_lock:
+        peers = current_peers
     peer_count = len(peers)
+    enabled_networks, geo_stats = await asyncio.gather(
+        asyncio.to_thread(get_enabled_networks_cached),
+        asyncio.to_thread(get_geo_db_stats_cached),
+    )
 
     # Count by network type with in/out breakdown
     network_counts = {
@@ -1030,14 +1804,45 @@ async def api_stats():
             else:
                 network_counts[network]['out'] += 1
 
-    # Get enabled networks from getnetworkinfo
-    enabled_networks = get_enabled_networks()
-
     # Get pending geo count for map status
-    with geo_pending_lock:
-        pending = geo_pending_count
+    with geo_pending_cv:
+        pending = len(geo_pending)
+
+    system_stats = get_system_stats_cached()
+
+    # Geo DB entry count (cheap SQLite count)
+    geo_entry_count = geo_stats.get('entries', 0)
+
+    return ORJSONResponse({
+        'connected': peer_count,
+        'networks': network_counts,
+        'enabled_networks': enabled_networks,
+        'geo_pending': pending,
+        'last_update': datetime.now().strftime('%H:%M:%S'),
+        'refresh_interval': REFRESH_INTERVAL,
+        'system_stats': system_stats,
+        'geo_entry_count': geo_entry_count,
+    })
 
-    # System stats (CPU via /proc/stat, memory via /proc/meminfo) - very fast
+
+SYSTEM_STATS_TTL = 2  # Seconds every /api/stats poller shares one /proc sample
+_system_stats_cache = (0.0, None)
+_system_stats_lock = threading.Lock()
+_prev_cpu_sample = None
+
+
+def _meminfo_kb(buf: bytes, key: bytes) -> int:
+    """Value (kB) of one /proc/meminfo field, 0 if it's missing"""
+    start = buf.find(key)
+    if start < 0:
+        return 0
+    end = buf.find(b'\n', start)
+    return int(buf[start + len(key):end if end >= 0 else None].split()[0])
+
+
+def read_system_stats() -> dict:
+    """System stats (CPU via /proc/stat, memory via /proc/meminfo) - very fast"""
+    global _prev_cpu_sample
     system_stats = {'cpu_pct': None, 'mem_pct': None, 'cpu_breakdown': None, 'mem_used_mb': None, 'mem_total_mb': None}
     try:
         # CPU usage via /proc/stat (instant read, compare with previous sample)
@@ -1053,8 +1858,8 @@ async def api_stats():
                     user, nice, system, idle_val, iowait, irq, softirq, steal = vals
                     idle = idle_val + iowait
                     total = sum(vals)
-                    if hasattr(api_stats, '_prev_cpu'):
-                        prev_idle, prev_total, prev_vals = api_stats._prev_cpu
+                    if _prev_cpu_sample:
+                        prev_idle, prev_total, prev_vals = _prev_cpu_sample
                         d_idle = idle - prev_idle
                         d_total = total - prev_total
                         if d_total > 0:
@@ -1068,7 +1873,7 @@ async def api_stats():
                                 'steal': round(100 * dv[7] / d_total, 1),
                                 'idle': round(100 * (dv[3] + dv[4]) / d_total, 1),  # idle + iowait
                             }
-                    api_stats._prev_cpu = (idle, total, vals)
+                    _prev_cpu_sample = (idle, total, vals)
         except:
             pass
 
@@ -1077,43 +1882,37 @@ async def api_stats():
         mem_used_mb = None
         mem_total_mb = None
         try:
-            with open('/proc/meminfo', 'r') as f:
-                mem_total = 0
-                mem_avail = 0
-                for line in f:
-                    if line.startswith('MemTotal:'):
-                        mem_total = int(line.split()[1])
-                    elif line.startswith('MemAvailable:'):
-                        mem_avail = int(line.split()[1])
-                if mem_total > 0:
-                    mem_pct = round((1 - mem_avail / mem_total) * 100, 1)
-                    mem_total_mb = round(mem_total / 1024)
-                    mem_used_mb = round((mem_total - mem_avail) / 1024)
+            # One raw read and two byte searches - no per-line str objects for the ~50 fields we skip
+            with open('/proc/meminfo', 'rb') as f:
+                buf = f.read()
+            mem_total = _meminfo_kb(buf, b'MemTotal:')
+            mem_avail = _meminfo_kb(buf, b'MemAvailable:')
+            if mem_total > 0:
+                mem_pct = round((1 - mem_avail / mem_total) * 100, 1)
+                mem_total_mb = round(mem_total / 1024)
+                mem_used_mb = round((mem_total - mem_avail) / 1024)
         except:
             pass
 
         system_stats = {'cpu_pct': cpu_pct, 'mem_pct': mem_pct, 'cpu_breakdown': cpu_breakdown, 'mem_used_mb': mem_used_mb, 'mem_total_mb': mem_total_mb}
     except:
         pass
+    return system_stats
 
-    # Geo DB entry count (cheap SQLite count)
-    geo_entry_count = 0
-    try:
-        stats = get_geo_db_stats()
-        geo_entry_count = stats.get('entries', 0)
-    except:
-        pass
 
-    return {
-        'connected': peer_count,
-        'networks': network_counts,
-        'enabled_networks': enabled_networks,
-        'geo_pending': pending,
-        'last_update': datetime.now().strftime('%H:%M:%S'),
-        'refresh_interval': REFRESH_INTERVAL,
-        'system_stats': system_stats,
-        'geo_entry_count': geo_entry_count,
-    }
+def get_system_stats_cached() -> dict:
+    """read_system_stats(), re-sampled at most once per SYSTEM_STATS_TTL.
+
+    Besides saving the reads, this keeps the CPU delta meaningful with several dashboards
+    open - otherwise each poll would re-baseline the sample the next one diffs against.
+    """
+    global _system_stats_cache
+    with _system_stats_lock:
+        sampled_at, stats = _system_stats_cache
+        if stats is None or time.time() - sampled_at > SYSTEM_STATS_TTL:
+            stats = read_system_stats()
+            _system_stats_cache = (time.time(), stats)
+    return stats
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -1151,9 +1950,9 @@ async def api_netspeed():
                 result['rx_bps'] = max(0, (rx_total - _prev_net_sample['rx']) / dt)
                 result['tx_bps'] = max(0, (tx_total - _prev_net_sample['tx']) / dt)
         _prev_net_sample = {'rx': rx_total, 'tx': tx_total, 'ts': now}
-        return result
+        return ORJSONResponse(result)
     except Exception as e:
-        return {'rx_bps': 0, 'tx_bps': 0, 'error': str(e)}
+        return ORJSONResponse({'rx_bps': 0, 'tx_bps': 0, 'error': str(e)})
 
 
 @app.get("/api/info")
@@ -1171,112 +1970,97 @@ async def api_info(currency: str = "USD"):
         'subversion': None,
     }
 
+    # Node stats (shared TTL cache), price and geo DB stats run alongside each other,
+    # then each section fills in from its own result
+    price_task = asyncio.ensure_future(asyncio.to_thread(fetch_btc_price, currency))
+    node_task = asyncio.ensure_future(asyncio.to_thread(get_node_info_cached))
+    geo_stats_task = asyncio.ensure_future(asyncio.to_thread(get_geo_db_stats_cached))
+
     # 1. Bitcoin price from Coinbase API
     try:
-        response = requests.get(f"https://api.coinbase.com/v2/prices/BTC-{currency}/spot", timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            price = data.get('data', {}).get('amount')
-            if price:
-                result['btc_price'] = price
+        price = await price_task
+        if price:
+            result['btc_price'] = price
     except Exception as e:
         print(f"BTC price fetch error: {e}")
 
+    try:
+        header, info, index_info, netinfo, mempoolinfo = await node_task
+    except Exception as e:
+        print(f"Node info fetch error: {e}")
+        # Every node section then reads as unavailable; price and geo DB stats still return
+        header = info = index_info = netinfo = mempoolinfo = RPCError(str(e))
+
     # 2. Last block info
     try:
-        # Get best block hash
-        cmd = config.get_cli_command() + ['getbestblockhash']
-        r = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-        if r.returncode == 0:
-            blockhash = r.stdout.strip()
-            # Get block header
-            cmd = config.get_cli_command() + ['getblockheader', blockhash]
-            r = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-            if r.returncode == 0:
-                header = json.loads(r.stdout)
-                height = header.get('height', 0)
-                block_time = header.get('time', 0)
-                result['last_block'] = {
-                    'height': height,
-                    'time': block_time
-                }
+        header = rpc_result(header)
+        height = header.get('height', 0)
+        block_time = header.get('time', 0)
+        result['last_block'] = {
+            'height': height,
+            'time': block_time
+        }
+    except RPCError:
+        pass  # Node down or still starting - the panel just shows it as unavailable
     except Exception as e:
         print(f"Last block fetch error: {e}")
 
     # 3. Blockchain stats (size, pruned, indexed, IBD status)
+    # Check if txindex is enabled
+    indexed = False
     try:
-        cmd = config.get_cli_command() + ['getblockchaininfo']
-        r = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-        if r.returncode == 0:
-            info = json.loads(r.stdout)
-            pruned = info.get('pruned', False)
-            size_bytes = info.get('size_on_disk', 0)
-            size_gb = round(size_bytes / 1e9, 1)
-            ibd = info.get('initialblockdownload', False)
-
-            # Check if txindex is enabled
-            indexed = False
-            try:
-                cmd = config.get_cli_command() + ['getindexinfo']
-                r2 = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-                if r2.returncode == 0:
-                    index_info = json.loads(r2.stdout)
-                    indexed = 'txindex' in index_info
-            except:
-                pass
-
-            result['blockchain'] = {
-                'size_gb': size_gb,
-                'pruned': pruned,
-                'indexed': indexed,
-                'ibd': ibd
-            }
+        indexed = 'txindex' in rpc_result(index_info)
+    except:
+        pass
+    try:
+        info = rpc_result(info)
+        pruned = info.get('pruned', False)
+        size_bytes = info.get('size_on_disk', 0)
+        size_gb = round(size_bytes / 1e9, 1)
+        ibd = info.get('initialblockdownload', False)
+
+        result['blockchain'] = {
+            'size_gb': size_gb,
+            'pruned': pruned,
+            'indexed': indexed,
+            'ibd': ibd
+        }
+    except RPCError:
+        pass
     except Exception as e:
         print(f"Blockchain stats fetch error: {e}")
 
     # 4. Network scores from getnetworkinfo localaddresses
     try:
-        cmd = config.get_cli_command() + ['getnetworkinfo']
-        r = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-        if r.returncode == 0:
-            netinfo = json.loads(r.stdout)
-            result['subversion'] = netinfo.get('subversion', '')
-            result['connected'] = netinfo.get('connections', 0)
-            local_addrs = netinfo.get('localaddresses', [])
-            scores = {'ipv4': None, 'ipv6': None}
-            for addr_info in local_addrs:
-                addr = addr_info.get('address', '')
-                score = addr_info.get('score', 0)
-                # Determine network type
-                if addr.endswith('.onion') or addr.endswith('.i2p'):
-                    continue  # Skip Tor/I2P
-                elif addr.startswith('fc') or addr.startswith('fd'):
-                    continue  # Skip CJDNS
-                elif ':' in addr and addr.count(':') > 1:
-                    # IPv6
-                    if scores['ipv6'] is None or score > scores['ipv6']:
-                        scores['ipv6'] = score
-                else:
-                    # IPv4
-                    if scores['ipv4'] is None or score > scores['ipv4']:
-                        scores['ipv4'] = score
-            result['network_scores'] = scores
+        netinfo = rpc_result(netinfo)
+        result['subversion'] = netinfo.get('subversion', '')
+        result['connected'] = netinfo.get('connections', 0)
+        local_addrs = netinfo.get('localaddresses', [])
+        scores = {'ipv4': None, 'ipv6': None}
+        for addr_info in local_addrs:
+            score = addr_info.get('score', 0)
+            # Same classifier as peers (one ipaddress parse); Tor/I2P/CJDNS have no score slot
+            network_type = get_network_type(addr_info.get('address', ''))
+            if network_type in scores and (scores[network_type] is None or score > scores[network_type]):
+                scores[network_type] = score
+        result['network_scores'] = scores
+    except RPCError:
+        pass
     except Exception as e:
         print(f"Network scores fetch error: {e}")
 
     # 5. Mempool size (lightweight RPC)
     try:
-        cmd = config.get_cli_command() + ['getmempoolinfo']
-        r = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-        if r.returncode == 0:
-            mempoolinfo = json.loads(r.stdout)
-            result['mempool_size'] = mempoolinfo.get('size', 0)
+        mempoolinfo = rpc_result(mempoolinfo)
+        result['mempool_size'] = mempoolinfo.get('size', 0)
+    except RPCError:
+        pass
     except Exception as e:
         print(f"Mempool info fetch error: {e}")
 
     # 6. Geo database stats (always returned so frontend can show status)
     try:
-        stats = get_geo_db_stats()
+        stats = await geo_stats_task
         if stats.get('entries', 0) > 0:
             oldest_age_days = None
             if stats.get('oldest_updated'):
@@ -1288,32 +2072,34 @@ async def api_info(currency: str = "USD"):
     except Exception:
         result['geo_db_stats'] = {'status': 'error', 'error': 'Failed to query database'}
 
-    return result
+    return ORJSONResponse(result)
 
 
 @app.get("/api/events")
-async def api_events(request: Request):
+async def api_events():
     """Server-Sent Events endpoint for real-time updates"""
+    from sse_starlette.sse import EventSourceResponse  # Deferred: pulls in uvicorn (see create_server)
 
-    async def event_generator():
-        global last_update_type
-        # Send initial connected message
-        yield {"event": "message", "data": json.dumps({"type": "connected"})}
+    global sse_loop
+    sse_loop = asyncio.get_running_loop()
 
-        while not stop_flag.is_set():
-            # Check if client disconnected
-            if await request.is_disconnected():
-                break
+    async def event_generator():
+        client_queue = asyncio.Queue(maxsize=SSE_QUEUE_SIZE)
+        sse_subscribers.add(client_queue)
+        try:
+            # Send initial connected message
+            yield {"event": "message", "data": SSE_CONNECTED}
 
-            # Wait for update event or timeout for keepalive (short timeout for fast shutdown)
-            if sse_update_event.wait(timeout=2):
-                sse_update_event.clear()
-                yield {"event": "message", "data": json.dumps({"type": last_update_type})}
-            else:
-                # Send keepalive
-                yield {"event": "message", "data": json.dumps({"type": "keepalive"})}
+            # Park until the next prebuilt payload - EventSourceResponse sends the keep-alive pings and
+            # cancels us on disconnect; shutdown wakes us with None via wake_sse_clients()
+            while not stop_flag.is_set():
+                payload = await client_queue.get()
+                if payload is not None:
+                    yield {"event": "message", "data": payload}
+        finally:
+            sse_subscribers.discard(client_queue)
 
-    return EventSourceResponse(event_generator())
+    return EventSourceResponse(event_generator(), ping=SSE_PING_INTERVAL)
 
 
 @app.get("/api/mempool")
@@ -1326,23 +2112,17 @@ async def api_mempool(currency: str = "USD"):
     }
 
     try:
-        cmd = config.get_cli_command() + ['getmempoolinfo']
-        r = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-        if r.returncode == 0:
-            result['mempool'] = json.loads(r.stdout)
-        else:
-            result['error'] = r.stderr.strip() or 'Failed to get mempool info'
+        result['mempool'] = await rpc_call_async('getmempoolinfo')
+    except RPCError as e:
+        result['error'] = str(e) or 'Failed to get mempool info'
     except Exception as e:
         result['error'] = str(e)
 
     # Also fetch BTC price for total fees display
     try:
-        response = requests.get(f"https://api.coinbase.com/v2/prices/BTC-{currency}/spot", timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            price = data.get('data', {}).get('amount')
-            if price:
-                result['btc_price'] = float(price)
+        price = await asyncio.to_thread(fetch_btc_price, currency)
+        if price:
+            result['btc_price'] = float(price)
     except Exception:
         pass
 
@@ -1358,12 +2138,9 @@ async def api_blockchain():
     }
 
     try:
-        cmd = config.get_cli_command() + ['getblockchaininfo']
-        r = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-        if r.returncode == 0:
-            result['blockchain'] = json.loads(r.stdout)
-        else:
-            result['error'] = r.stderr.strip() or 'Failed to get blockchain info'
+        result['blockchain'] = await rpc_call_async('getblockchaininfo')
+    except RPCError as e:
+        result['error'] = str(e) or 'Failed to get blockchain info'
     except Exception as e:
         result['error'] = str(e)
 
@@ -1371,50 +2148,47 @@ async def api_blockchain():
 
 
 @app.post("/api/peer/disconnect")
-async def api_peer_disconnect(request: Request):
+async def api_peer_disconnect(body: PeerIdBody):
     """Disconnect a peer by ID"""
     try:
-        data = await request.json()
-        peer_id = data.get('peer_id')
+        peer_id = body.peer_id
 
         if peer_id is None:
             return {'success': False, 'error': 'peer_id is required'}
 
         # Use disconnectnode with empty address and nodeid
-        cmd = config.get_cli_command() + ['disconnectnode', '', str(peer_id)]
-        r = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-
-        if r.returncode == 0:
-            return {'success': True}
-        else:
-            return {'success': False, 'error': r.stderr.strip() or 'Sent, no response (status unknown)'}
+        await rpc_call_async('disconnectnode', '', peer_id)
+        return {'success': True}
+    except RPCError as e:
+        return {'success': False, 'error': str(e) or 'Sent, no response (status unknown)'}
     except Exception as e:
         return {'success': False, 'error': str(e)}
 
 
 @app.post("/api/peer/ban")
-async def api_peer_ban(request: Request):
+async def api_peer_ban(body: PeerIdBody):
     """Ban a peer by ID (24 hours). Only works for IPv4/IPv6."""
     try:
-        data = await request.json()
-        peer_id = data.get('peer_id')
+        peer_id = body.peer_id
 
         if peer_id is None:
             return {'success': False, 'error': 'peer_id is required'}
 
-        # First, get peer info to find the address and network type
-        cmd = config.get_cli_command() + ['getpeerinfo']
-        r = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+        # Look the peer up in the refresh worker's snapshot (peer ids are never reused by Core)
+        with peers_lock:
+            peer = current_peers_by_id.get(peer_id)
 
-        if r.returncode != 0:
-            return {'success': False, 'error': 'Failed to get peer info'}
+        if not peer:
+            # Not in the last refresh (e.g. just connected) - ask Core for the current list
+            try:
+                peers = await rpc_call_async('getpeerinfo') or []
+            except RPCError:
+                return {'success': False, 'error': 'Failed to get peer info'}
 
-        peers = json.loads(r.stdout)
-        peer = None
-        for p in peers:
-            if p.get('id') == int(peer_id):
-                peer = p
-                break
+            for p in peers:
+                if p.get('id') == peer_id:
+                    peer = p
+                    break
 
         if not peer:
             return {'success': False, 'error': f'Peer ID {peer_id} not found'}
@@ -1430,60 +2204,62 @@ async def api_peer_ban(request: Request):
             }
 
         # Extract IP from address (remove port and brackets)
-        if addr.startswith('['):
-            # IPv6: [2001:db8::1]:8333 -> 2001:db8::1
-            ip = addr.split(']')[0][1:]
-        elif ':' in addr and addr.count(':') <= 1:
-            # IPv4: 192.168.1.1:8333 -> 192.168.1.1
-            ip = addr.rsplit(':', 1)[0]
-        else:
-            ip = addr
+        ip = extract_ip(addr)
 
         # Ban for 24 hours (86400 seconds)
-        cmd = config.get_cli_command() + ['setban', ip, 'add', '86400']
-        r = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-
-        if r.returncode == 0:
-            return {'success': True, 'banned_ip': ip, 'network': network}
-        else:
-            return {'success': False, 'error': r.stderr.strip() or 'Sent, no response (status unknown)'}
+        await rpc_call_async('setban', ip, 'add', 86400)
+        invalidate_bans_cache()
+        return {'success': True, 'banned_ip': ip, 'network': network}
+    except RPCError as e:
+        return {'success': False, 'error': str(e) or 'Sent, no response (status unknown)'}
     except Exception as e:
         return {'success': False, 'error': str(e)}
 
 
 @app.post("/api/peer/unban")
-async def api_peer_unban(request: Request):
+async def api_peer_unban(body: AddressBody):
     """Unban a specific IP/subnet"""
     try:
-        data = await request.json()
-        address = data.get('address')
+        address = body.address
 
         if not address:
             return {'success': False, 'error': 'address is required'}
 
-        cmd = config.get_cli_command() + ['setban', address, 'remove']
-        r = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-
-        if r.returncode == 0:
-            return {'success': True}
-        else:
-            return {'success': False, 'error': r.stderr.strip() or 'Failed to unban address'}
+        await rpc_call_async('setban', address, 'remove')
+        invalidate_bans_cache()
+        return {'success': True}
+    except RPCError as e:
+        return {'success': False, 'error': str(e) or 'Failed to unban address'}
     except Exception as e:
         return {'success': False, 'error': str(e)}
 
 
+BANS_CACHE_TTL = 5  # Seconds listbanned is reused (several tabs opening the bans panel share one RPC)
+_bans_cache = (0.0, None)
+_bans_generation = 0  # Bumped on every invalidation; a listbanned that started before it isn't cached
+
+
+def invalidate_bans_cache():
+    """Drop the cached ban list after ban/unban/clear so the panel shows the change immediately"""
+    global _bans_cache, _bans_generation
+    _bans_cache = (0.0, None)
+    _bans_generation += 1
+
+
 @app.get("/api/bans")
 async def api_bans():
     """List all banned IPs"""
+    global _bans_cache
     try:
-        cmd = config.get_cli_command() + ['listbanned']
-        r = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-
-        if r.returncode == 0:
-            bans = json.loads(r.stdout)
-            return {'success': True, 'bans': bans}
-        else:
-            return {'success': False, 'error': r.stderr.strip() or 'Failed to list bans', 'bans': []}
+        fetched_at, bans = _bans_cache
+        if bans is None or time.time() - fetched_at > BANS_CACHE_TTL:
+            generation = _bans_generation
+            bans = await rpc_call_async('listbanned')
+            if generation == _bans_generation:  # A ban/unban/clear during the fetch may not be in this list
+                _bans_cache = (time.time(), bans)
+        return {'success': True, 'bans': bans}
+    except RPCError as e:
+        return {'success': False, 'error': str(e) or 'Failed to list bans', 'bans': []}
     except Exception as e:
         return {'success': False, 'error': str(e), 'bans': []}
 
@@ -1492,58 +2268,47 @@ async def api_bans():
 async def api_bans_clear():
     """Clear all bans"""
     try:
-        cmd = config.get_cli_command() + ['clearbanned']
-        r = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-
-        if r.returncode == 0:
-            return {'success': True}
-        else:
-            return {'success': False, 'error': r.stderr.strip() or 'Failed to clear bans'}
+        await rpc_call_async('clearbanned')
+        invalidate_bans_cache()
+        return {'success': True}
+    except RPCError as e:
+        return {'success': False, 'error': str(e) or 'Failed to clear bans'}
     except Exception as e:
         return {'success': False, 'error': str(e)}
 
 
+# addnode target: I2P, Tor, [CJDNS], [IPv6] or IPv4 host, then an optional :port
+_CONNECT_ADDR_RE = re.compile(
+    r'(?i)^(?:(?P<i2p>.+\.b32\.i2p)|(?P<onion>.+\.onion)|\[(?P<cjdns>fc[^\]]*)\]|\[(?P<ipv6>[^\]]+)\]'
+    r'|(?P<ipv4>[^:\[\]]+))(?P<port>:\d+)?$')
+
+
 @app.post("/api/peer/connect")
-async def api_peer_connect(request: Request):
+async def api_peer_connect(body: AddressBody):
     """Connect to a peer using addnode onetry"""
     try:
-        data = await request.json()
-        address = data.get('address', '').strip()
+        address = (body.address or '').strip()
 
         if not address:
             return {'success': False, 'error': 'address is required'}
 
-        # Normalize the address based on type
+        # Normalize the address based on type (one match tags the network and any port)
         normalized = address
-
-        # Detect address type and normalize
-        if '.b32.i2p' in address.lower():
+        m = _CONNECT_ADDR_RE.match(address)
+        if m is None or m['cjdns']:
+            pass  # CJDNS or unrecognized - pass as-is (Core handles it)
+        elif m['i2p']:
             # I2P - must have :0 port
-            if ':' not in address or not address.endswith(':0'):
+            if m['port'] != ':0':
                 return {'success': False, 'error': 'I2P addresses must end with :0 (e.g., abc...xyz.b32.i2p:0)'}
-        elif '.onion' in address.lower():
-            # Tor - add :8333 if no port
-            if ':' not in address:
-                normalized = address + ':8333'
-        elif address.startswith('[') and address.startswith('[fc'):
-            # CJDNS - pass as-is (Core handles it)
-            pass
-        elif address.startswith('['):
-            # IPv6 - add :8333 if no port
-            if ']:' not in address:
-                normalized = address + ':8333'
-        else:
-            # IPv4 - add :8333 if no port
-            if ':' not in address:
-                normalized = address + ':8333'
-
-        cmd = config.get_cli_command() + ['addnode', normalized, 'onetry']
-        r = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-
-        if r.returncode == 0:
-            return {'success': True, 'address': normalized}
-        else:
-            return {'success': False, 'error': r.stderr.strip() or 'Failed to connect to peer'}
+        elif not m['port']:
+            # Tor / IPv6 / IPv4 - add :8333 if no port
+            normalized = address + ':8333'
+
+        await rpc_call_async('addnode', normalized, 'onetry')
+        return {'success': True, 'address': normalized}
+    except RPCError as e:
+        return {'success': False, 'error': str(e) or 'Failed to connect to peer'}
     except Exception as e:
         return {'success': False, 'error': str(e)}
 
@@ -1557,7 +2322,7 @@ async def api_geodb_update():
         TMP_DIR.mkdir(parents=True, exist_ok=True)
         tmp_path = TMP_DIR / 'geo_download.db'
         # Download remote database
-        resp = requests.get(GEO_DB_REPO_URL, timeout=60, stream=True)
+        resp = http_session().get(GEO_DB_REPO_URL, timeout=60, stream=True)
         if resp.status_code != 200:
             return {'success': False, 'message': f'Download failed (HTTP {resp.status_code})'}
         with open(tmp_path, 'wb') as f:
@@ -1566,30 +2331,42 @@ async def api_geodb_update():
         # Validate it's a real SQLite database with the expected table
         try:
             tmp_conn = sqlite3.connect(tmp_path)
-            remote_rows = tmp_conn.execute('SELECT * FROM geo_cache').fetchall()
+            remote_count = tmp_conn.execute('SELECT COUNT(*) FROM geo_cache').fetchone()[0]
             col_names = [desc[0] for desc in tmp_conn.execute('SELECT * FROM geo_cache LIMIT 0').description]
             tmp_conn.close()
         except Exception:
             tmp_path.unlink(missing_ok=True)
             return {'success': False, 'message': 'Downloaded file is not a valid geo database'}
-        remote_count = len(remote_rows)
         if remote_count == 0:
             tmp_path.unlink(missing_ok=True)
             return {'success': False, 'message': 'Remote database is empty'}
         if not GEO_DB_FILE.exists():
             # No local DB — just use the downloaded one
+            close_geo_db()
             tmp_path.rename(GEO_DB_FILE)
+            invalidate_geo_db_stats()
             return {'success': True, 'message': f'Downloaded database ({remote_count} entries)'}
-        # Merge: read remote rows into memory, insert into local DB
-        tmp_path.unlink(missing_ok=True)
-        placeholders = ','.join(['?'] * len(col_names))
-        conn = sqlite3.connect(GEO_DB_FILE, timeout=5)
-        before = conn.execute('SELECT COUNT(*) FROM geo_cache').fetchone()[0]
-        conn.executemany(f"INSERT OR IGNORE INTO geo_cache ({','.join(col_names)}) VALUES ({placeholders})", remote_rows)
-        conn.commit()
-        total = conn.execute('SELECT COUNT(*) FROM geo_cache').fetchone()[0]
-        conn.close()
-        new_count = total - before
+        # Merge: attach the download and copy missing rows inside SQLite (no rows pass through Python)
+        columns = ','.join(col_names)
+        try:
+            with geo_db_writer() as conn:
+                conn.execute('ATTACH DATABASE ? AS remote', (str(tmp_path),))
+                try:
+                    # BEGIN IMMEDIATE takes the write lock up front; readers keep going under WAL
+                    conn.execute('BEGIN IMMEDIATE')
+                    cursor = conn.execute(f"INSERT OR IGNORE INTO geo_cache ({columns}) SELECT {columns} FROM remote.geo_cache")
+                    new_count = cursor.rowcount
+                    total = conn.execute('SELECT COUNT(*) FROM geo_cache').fetchone()[0]
+                    conn.execute('COMMIT')
+                except Exception:
+                    if conn.in_transaction:
+                        conn.execute('ROLLBACK')
+                    raise
+                finally:
+                    conn.execute('DETACH DATABASE remote')
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        invalidate_geo_db_stats()
         if new_count > 0:
             return {'success': True, 'message': f'+{new_count} new entries ({total} total)'}
         else:
@@ -1598,9 +2375,9 @@ async def api_geodb_update():
         return {'success': False, 'message': str(e)}
 
 
-@app.get("/api/cli-info")
-async def api_cli_info():
-    """Get the CLI command info for display to user"""
+@functools.lru_cache(maxsize=1)
+def get_cli_info() -> dict:
+    """CLI command info - config is loaded once before the server starts, so built on first request"""
     cmd_parts = config.get_cli_command()
     return {
         'cli_path': config.cli_path,
@@ -1611,6 +2388,12 @@ async def api_cli_info():
     }
 
 
+@app.get("/api/cli-info")
+async def api_cli_info():
+    """Get the CLI command info for display to user"""
+    return ORJSONResponse(get_cli_info())
+
+
 @app.get("/", response_class=HTMLResponse)
 async def root(request: Request):
     """Serve the main dashboard page"""
@@ -1626,7 +2409,6 @@ if STATIC_DIR.exists():
 # MAIN
 # ═══════════════════════════════════════════════════════════════════════════════
 
-import asyncio
 import signal
 
 # ANSI color codes
@@ -1641,6 +2423,103 @@ C_PINK = "\033[35m"
 C_CYAN = "\033[36m"
 C_WHITE = "\033[37m"
 
+# Plain output under systemd, pipes and log files (or when NO_COLOR is set)
+if not sys.stdout.isatty() or os.environ.get("NO_COLOR"):
+    C_RESET = C_BOLD = C_DIM = C_RED = C_GREEN = C_YELLOW = C_BLUE = C_PINK = C_CYAN = C_WHITE = ""
+
+# Banner pieces - rules and logo rendered once at import
+_HR_EQ = f"{C_BLUE}{'═' * 84}{C_RESET}"
+_HR_DASH = f"{C_BLUE}{'─' * 84}{C_RESET}"
+_LOGO_SEP = f"  {C_BLUE}{'─' * 52}{C_RESET}"  # Width of MBCORE ASCII art
+_LOGO = "\n".join(f"  {C_BOLD}{C_BLUE}{art}{C_RESET}" for art in (
+    "███╗   ███╗██████╗  ██████╗ ██████╗ ██████╗ ███████╗",
+    "████╗ ████║██╔══██╗██╔════╝██╔═══██╗██╔══██╗██╔════╝",
+    "██╔████╔██║██████╔╝██║     ██║   ██║██████╔╝█████╗  ",
+    "██║╚██╔╝██║██╔══██╗██║     ██║   ██║██╔══██╗██╔══╝  ",
+    "██║ ╚═╝ ██║██████╔╝╚██████╗╚██████╔╝██║  ██║███████╗",
+    "╚═╝     ╚═╝╚═════╝  ╚═════╝ ╚═════╝ ╚═╝  ╚═╝╚══════╝",
+))
+
+# Startup banner - the static head (logo, credits, instructions) is UTF-8 encoded once at import;
+# main() fills in the URLs of the template part
+_BANNER_HEAD_BYTES = ("\n".join([
+    "",
+    _HR_EQ,
+    _LOGO,
+    f"  Dashboard v{VERSION} {C_WHITE}(Bitcoin Core peer info / map / tools){C_RESET}",
+    _LOGO_SEP,
+    "  Created by mbhillrn",
+    "  MIT License – Free to use, modify, and distribute",
+    f"  {C_BOLD}{C_YELLOW}Support (btc):{C_RESET} {C_GREEN}bc1qy63057zemrskq0n02avq9egce4cpuuenm5ztf5{C_RESET}",
+    _HR_EQ,
+    f"  {C_BOLD}{C_YELLOW}** INSTRUCTIONS TO VIEW DASHBOARD! **{C_RESET}",
+    _HR_EQ,
+    "",
+    "  The dashboard is viewed in your WEB BROWSER (Chrome, Firefox, etc).",
+    "  This is easy — just open ONE of the links below.",
+    "",
+]) + "\n").encode("utf-8")
+_BANNER_TEMPLATE = "\n".join([
+    f"  {C_BOLD}{C_YELLOW}Opening your browser on the SAME computer this program is running on:{C_RESET}",
+    f"      {C_CYAN}{{url_local}}{C_RESET}",
+    "",
+    f"  {C_BOLD}{C_YELLOW}Opening your browser on ANOTHER computer on your local network:{C_RESET}",
+    f"    {C_BOLD}{C_YELLOW}Option A{C_RESET} – Direct network access {C_BOLD}{C_YELLOW}(recommended){C_RESET}",
+    f"      {C_CYAN}{{url_lan}}{C_RESET}  {C_DIM}<- auto-detected node IP{C_RESET}",
+    f"{{firewall_line}}      {C_DIM}(If you use a firewall, it may need to be configured.{C_RESET}",
+    f"      {C_DIM} Please see the README or run the Firewall Helper Tool{C_RESET}",
+    f"      {C_DIM} from the main menu (Option 3).){C_RESET}",
+    "",
+    f"    {C_BOLD}{C_YELLOW}Option B{C_RESET} – SSH tunnel (advanced, see README)",
+    f"      {C_CYAN}{{url_local}}{C_RESET}",
+    "",
+    _HR_DASH,
+    f"  {C_RED}🔴 The README has been created to guide you through this process.{C_RESET}",
+    f"  {C_RED}🔴 Please review it if this is your first time running MBCore or need to troubleshoot.{C_RESET}",
+    _HR_DASH,
+    f"  Press {C_PINK}Ctrl+C{C_RESET} to stop the dashboard (press twice to force)",
+    _HR_EQ,
+    "",
+]) + "\n"
+
+# Shutdown notices, pre-encoded for a raw os.write from the signal path (no stdout lock)
+_MSG_SHUTDOWN = f"\n{C_YELLOW}Shutting down... (press Ctrl+C again to force){C_RESET}\n".encode()
+_MSG_FORCE = f"\n{C_RED}Force exit!{C_RESET}\n".encode()
+
+# Seconds the banner waits for the background LAN/firewall probe before printing placeholders
+STARTUP_PROBE_WAIT = 0.3
+# Seconds shutdown waits (in total) for the background workers to exit their loops
+BG_WORKER_JOIN_TIMEOUT = 2.0
+
+
+def format_firewall_line(firewall_name, firewall_active, port: int) -> str:
+    """Banner warning line for an active firewall ('' when none detected)"""
+    if firewall_active and firewall_name:
+        return f"      {C_RED}Firewall detected ({firewall_name}): may need configuring for port {port}{C_RESET}\n"
+    return ""
+
+# Startup prompts give up after this many seconds so an unattended restart can't hang forever
+PORT_PROMPT_TIMEOUT = 300
+# MBCORE_NONINTERACTIVE=1 skips the port prompts entirely (headless / auto-restart setups)
+NONINTERACTIVE = os.environ.get('MBCORE_NONINTERACTIVE') == '1'
+_INVALID_CHOICE_MSG = f"{C_RED}Invalid choice. Enter 1 or q{C_RESET}\n"
+
+
+def _read_choice(prompt: str, timeout: Optional[float] = None) -> Optional[bytes]:
+    """Prompt and read one line of raw stdin - returns the lowercased bytes, or None if nobody typed one"""
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    if timeout is not None and os.name == 'posix':
+        ready, _, _ = select.select([sys.stdin], [], [], timeout)
+        if not ready:
+            sys.stdout.write("\n")
+            return None
+    line = sys.stdin.buffer.readline()
+    if not line:
+        raise EOFError
+    return line.strip().lower()
+
+
 def get_manual_port() -> int:
     """Prompt user for a manual port number"""
     print(f"\n{C_BOLD}Enter a port number:{C_RESET}")
@@ -1649,12 +2528,15 @@ def get_manual_port() -> int:
 
     while True:
         try:
-            port_input = input(f"{C_YELLOW}Port (or 'q' to quit): {C_RESET}").strip().lower()
+            port_input = _read_choice(f"{C_YELLOW}Port (or 'q' to quit): {C_RESET}", PORT_PROMPT_TIMEOUT)
         except (KeyboardInterrupt, EOFError):
             print()
             sys.exit(0)
 
-        if port_input == 'q':
+        if port_input is None:
+            sys.stdout.write(f"{C_RED}No port entered in {PORT_PROMPT_TIMEOUT}s, exiting{C_RESET}\n")
+            sys.exit(1)
+        if port_input == b'q':
             sys.exit(0)
 
         try:
@@ -1670,6 +2552,43 @@ def get_manual_port() -> int:
             print(f"{C_RED}Invalid port number{C_RESET}")
 
 
+def create_server(**config_kwargs):
+    """Build the uvicorn server for app (uvicorn is imported here to keep module import light)"""
+    import uvicorn
+
+    class DashboardServer(uvicorn.Server):
+        """uvicorn server whose shutdown also stops the background workers and wakes SSE clients"""
+
+        def __init__(self, config):
+            super().__init__(config)
+            self.shutdown_count = 0
+
+        @contextmanager
+        def capture_signals(self):
+            # Deliver SIGINT/SIGTERM through the event loop's wakeup fd so the loop reacts immediately
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(sig, self.handle_exit, sig, None)
+            try:
+                yield
+            finally:
+                for sig in (signal.SIGINT, signal.SIGTERM):
+                    loop.remove_signal_handler(sig)
+
+        def handle_exit(self, sig, frame):
+            self.shutdown_count += 1
+            stop_background_workers()
+            wake_sse_clients()  # Wake up SSE generators
+            if self.shutdown_count == 1:
+                os.write(1, _MSG_SHUTDOWN)
+                super().handle_exit(sig, frame)
+            else:
+                os.write(1, _MSG_FORCE)
+                os._exit(0)
+
+    return DashboardServer(uvicorn.Config(app, **config_kwargs))
+
+
 def main():
     global geo_db_enabled, geo_db_auto_update
 
@@ -1699,127 +2618,135 @@ def main():
                 print(f"{C_GREEN}✓ Port {port} is now available{C_RESET}\n")
                 break
         else:
-            # Still not available - ask user what to do
+            # Still not available
             print(f"\n{C_RED}✗ Port {port} is still in use{C_RESET}")
-            print(f"{C_YELLOW}  Another application may be using this port.{C_RESET}")
-            print(f"{C_DIM}  Tip: Check with 'lsof -i :{port}' or 'ss -tlnp | grep {port}'{C_RESET}")
-            print()
-            print(f"{C_BOLD}Choose an option:{C_RESET}")
-            print(f"  {C_GREEN}1{C_RESET}) Enter a different port manually")
-            print(f"  {C_GREEN}q{C_RESET}) Quit")
-            print()
+            if NONINTERACTIVE:
+                # No one to ask - keep the saved port; uvicorn reports the bind error if it never frees up
+                print(f"{C_YELLOW}  Non-interactive mode: starting on saved port {port} anyway{C_RESET}")
+            else:
+                # Ask user what to do
+                print(f"{C_YELLOW}  Another application may be using this port.{C_RESET}")
+                print(f"{C_DIM}  Tip: Check with 'lsof -i :{port}' or 'ss -tlnp | grep {port}'{C_RESET}")
+                print()
+                print(f"{C_BOLD}Choose an option:{C_RESET}")
+                print(f"  {C_GREEN}1{C_RESET}) Enter a different port manually")
+                print(f"  {C_GREEN}q{C_RESET}) Quit")
+                print()
+
+                while True:
+                    try:
+                        choice = _read_choice(f"{C_YELLOW}Enter choice (1/q): {C_RESET}", PORT_PROMPT_TIMEOUT)
+                    except (KeyboardInterrupt, EOFError):
+                        print()
+                        sys.exit(0)
+
+                    if choice is None:
+                        sys.stdout.write(f"{C_RED}No choice entered in {PORT_PROMPT_TIMEOUT}s, exiting{C_RESET}\n")
+                        sys.exit(1)
+                    elif choice == b'q':
+                        sys.exit(0)
+                    elif choice == b'1':
+                        port = get_manual_port()
+                        # Save the new port to config so it persists
+                        save_port_to_config(port)
+                        print(f"{C_GREEN}✓ Using port {port} (saved to config){C_RESET}\n")
+                        break
+                    else:
+                        sys.stdout.write(_INVALID_CHOICE_MSG)
+
+    # Bind now so the URLs in the banner answer as soon as they are printed
+    try:
+        listen_sock = bind_listen_socket(port)
+    except OSError as e:
+        print(f"{C_RED}✗ Could not listen on port {port}: {e}{C_RESET}")
+        sys.exit(1)
 
-            while True:
-                try:
-                    choice = input(f"{C_YELLOW}Enter choice (1/q): {C_RESET}").strip().lower()
-                except (KeyboardInterrupt, EOFError):
-                    print()
-                    sys.exit(0)
-
-                if choice == 'q':
-                    sys.exit(0)
-                elif choice == '1':
-                    port = get_manual_port()
-                    # Save the new port to config so it persists
-                    save_port_to_config(port)
-                    print(f"{C_GREEN}✓ Using port {port} (saved to config){C_RESET}\n")
-                    break
-                else:
-                    print(f"{C_RED}Invalid choice. Enter 1 or q{C_RESET}")
-
-    # Get local IPs and subnets
-    local_ips, subnets = get_local_ips()
-
-    # Start background threads
-    geo_thread = threading.Thread(target=geo_worker, daemon=True)
-    geo_thread.start()
-
-    refresh_thread = threading.Thread(target=refresh_worker, daemon=True)
-    refresh_thread.start()
-
-    # Initial addrman cache refresh
-    refresh_addrman_cache()
-
-    # Get primary LAN IP (first non-localhost)
-    lan_ip = local_ips[0] if local_ips else "127.0.0.1"
-    subnet = subnets[0] if subnets else "192.168.0.0/16"
-
-    # Detect firewall
-    firewall_name, firewall_active = detect_active_firewall()
-
-    # Print access info with colors and formatting
-    line_w = 84
-    logo_w = 52  # Width of MBCORE ASCII art
-    print("")
-    print(f"{C_BLUE}{'═' * line_w}{C_RESET}")
-    print(f"  {C_BOLD}{C_BLUE}███╗   ███╗██████╗  ██████╗ ██████╗ ██████╗ ███████╗{C_RESET}")
-    print(f"  {C_BOLD}{C_BLUE}████╗ ████║██╔══██╗██╔════╝██╔═══██╗██╔══██╗██╔════╝{C_RESET}")
-    print(f"  {C_BOLD}{C_BLUE}██╔████╔██║██████╔╝██║     ██║   ██║██████╔╝█████╗  {C_RESET}")
-    print(f"  {C_BOLD}{C_BLUE}██║╚██╔╝██║██╔══██╗██║     ██║   ██║██╔══██╗██╔══╝  {C_RESET}")
-    print(f"  {C_BOLD}{C_BLUE}██║ ╚═╝ ██║██████╔╝╚██████╗╚██████╔╝██║  ██║███████╗{C_RESET}")
-    print(f"  {C_BOLD}{C_BLUE}╚═╝     ╚═╝╚═════╝  ╚═════╝ ╚═════╝ ╚═╝  ╚═╝╚══════╝{C_RESET}")
-    print(f"  Dashboard v{VERSION} {C_WHITE}(Bitcoin Core peer info / map / tools){C_RESET}")
-    print(f"  {C_BLUE}{'─' * logo_w}{C_RESET}")
-    print(f"  Created by mbhillrn")
-    print(f"  MIT License – Free to use, modify, and distribute")
-    print(f"  {C_BOLD}{C_YELLOW}Support (btc):{C_RESET} {C_GREEN}bc1qy63057zemrskq0n02avq9egce4cpuuenm5ztf5{C_RESET}")
-    print(f"{C_BLUE}{'═' * line_w}{C_RESET}")
-    print(f"  {C_BOLD}{C_YELLOW}** INSTRUCTIONS TO VIEW DASHBOARD! **{C_RESET}")
-    print(f"{C_BLUE}{'═' * line_w}{C_RESET}")
-    print("")
-    print(f"  The dashboard is viewed in your WEB BROWSER (Chrome, Firefox, etc).")
-    print(f"  This is easy — just open ONE of the links below.")
-    print("")
-    url_lan = f"http://{lan_ip}:{port}"
-    url_local = f"http://127.0.0.1:{port}"
-    print(f"  {C_BOLD}{C_YELLOW}Opening your browser on the SAME computer this program is running on:{C_RESET}")
-    print(f"      {C_CYAN}{url_local}{C_RESET}")
-    print("")
-    print(f"  {C_BOLD}{C_YELLOW}Opening your browser on ANOTHER computer on your local network:{C_RESET}")
-    print(f"    {C_BOLD}{C_YELLOW}Option A{C_RESET} – Direct network access {C_BOLD}{C_YELLOW}(recommended){C_RESET}")
-    print(f"      {C_CYAN}{url_lan}{C_RESET}  {C_DIM}<- auto-detected node IP{C_RESET}")
-    # Show firewall warning if detected
-    if firewall_active and firewall_name:
-        print(f"      {C_RED}Firewall detected ({firewall_name}): may need configuring for port {port}{C_RESET}")
-    print(f"      {C_DIM}(If you use a firewall, it may need to be configured.{C_RESET}")
-    print(f"      {C_DIM} Please see the README or run the Firewall Helper Tool{C_RESET}")
-    print(f"      {C_DIM} from the main menu (Option 3).){C_RESET}")
-    print("")
-    print(f"    {C_BOLD}{C_YELLOW}Option B{C_RESET} – SSH tunnel (advanced, see README)")
-    print(f"      {C_CYAN}{url_local}{C_RESET}")
-    print("")
-    print(f"{C_BLUE}{'─' * line_w}{C_RESET}")
-    print(f"  {C_RED}🔴 The README has been created to guide you through this process.{C_RESET}")
-    print(f"  {C_RED}🔴 Please review it if this is your first time running MBCore or need to troubleshoot.{C_RESET}")
-    print(f"{C_BLUE}{'─' * line_w}{C_RESET}")
-    print(f"  Press {C_PINK}Ctrl+C{C_RESET} to stop the dashboard (press twice to force)")
-    print(f"{C_BLUE}{'═' * line_w}{C_RESET}")
-    print("")
-
-    # Signal handler for fast shutdown
-    shutdown_count = [0]
-    def signal_handler(signum, frame):
-        shutdown_count[0] += 1
-        stop_flag.set()
-        sse_update_event.set()  # Wake up SSE generators
-        if shutdown_count[0] == 1:
-            print(f"\n{C_YELLOW}Shutting down... (press Ctrl+C again to force){C_RESET}")
-        elif shutdown_count[0] >= 2:
-            print(f"\n{C_RED}Force exit!{C_RESET}")
-            os._exit(0)
-
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
-
-    # Run server
+    # Failed geo lookups from the last run keep their backoff
+    load_geo_retry()
+
+    # Start background workers (both loops exit once stop_flag is set). Daemon threads: a worker
+    # stuck in an RPC or ip-api call must not keep the process alive after shutdown
+    bg_threads = [
+        threading.Thread(target=geo_worker, name="mbcore-geo", daemon=True),
+        threading.Thread(target=refresh_worker, name="mbcore-refresh", daemon=True),
+    ]
+    for thread in bg_threads:
+        thread.start()
+
+    # Initial addrman cache refresh (getnodeaddresses can be slow - don't hold up the listen);
+    # a snapshot saved by a recent run is used instead and refresh_worker catches up on its own
+    if _addrman_cache_age() > ADDRMAN_MAX_AGE or not load_addrman_cache():
+        threading.Thread(target=refresh_addrman_cache, daemon=True).start()
+
+    # LAN IP and firewall are only needed for the banner - probe them in the background
+    # (a fresh result from the last run is used straight away; the probe then just refreshes it)
+    net_info = {}
+    net_info_ready = threading.Event()
+    banner_shown = threading.Event()
+
+    cached = load_net_cache()
+    if cached and cached.get('local_ips'):
+        net_info['lan_ip'] = cached['local_ips'][0]
+        net_info['firewall'] = (cached.get('firewall_name'), cached.get('firewall_active', False))
+        net_info_ready.set()
+
+    def probe_network():
+        local_ips, subnets = get_local_ips()
+        firewall_name, firewall_active = detect_active_firewall()
+        save_net_cache(local_ips, subnets, firewall_name, firewall_active)
+        if net_info_ready.is_set():
+            return
+        net_info['lan_ip'] = local_ips[0] if local_ips else "127.0.0.1"  # First non-localhost
+        net_info['firewall'] = (firewall_name, firewall_active)
+        net_info_ready.set()
+        # Banner went out with placeholders - print the detected values underneath it
+        banner_shown.wait()
+        if net_info['deferred']:
+            firewall_name, firewall_active = net_info['firewall']
+            sys.stdout.write(
+                f"  {C_BOLD}{C_YELLOW}Node LAN address detected:{C_RESET} {C_CYAN}http://{net_info['lan_ip']}:{port}{C_RESET}\n"
+                + format_firewall_line(firewall_name, firewall_active, port)
+            )
+            sys.stdout.flush()
+
+    threading.Thread(target=probe_network, daemon=True).start()
+    net_info['deferred'] = not net_info_ready.wait(STARTUP_PROBE_WAIT)
+
+    # Print access info (one pre-rendered byte buffer, one write)
+    if net_info['deferred']:
+        url_lan = "detecting..."
+        firewall_line = ""
+    else:
+        url_lan = f"http://{net_info['lan_ip']}:{port}"
+        firewall_line = format_firewall_line(*net_info['firewall'], port)
+    sys.stdout.flush()  # Anything already queued on the text layer goes out first
+    sys.stdout.buffer.write(_BANNER_HEAD_BYTES + _BANNER_TEMPLATE.format(
+        url_local=f"http://127.0.0.1:{port}",
+        url_lan=url_lan,
+        firewall_line=firewall_line,
+    ).encode("utf-8"))
+    sys.stdout.buffer.flush()
+    banner_shown.set()
+
+    # Run server (uvloop/httptools when installed, stock asyncio/h11 otherwise)
+    loop_impl = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http_impl = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    server = create_server(log_level="warning", loop=loop_impl, http=http_impl, access_log=False)
     try:
-        uvicorn.run(app, host="0.0.0.0", port=port, log_level="warning")
+        server.run(sockets=[listen_sock])
     except KeyboardInterrupt:
         pass
     except SystemExit:
         pass
     finally:
-        stop_flag.set()
+        stop_background_workers()
+        # Let a worker that is between calls finish its current write; one blocked on I/O is abandoned
+        deadline = time.monotonic() + BG_WORKER_JOIN_TIMEOUT
+        for thread in bg_threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        save_addrman_cache()
+        save_geo_retry()
+        close_geo_db()
         print(f"\n{C_GREEN}Shutdown complete.{C_RESET}")
 
 
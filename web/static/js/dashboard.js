@@ -1928,9 +1928,6 @@ function setupSSE() {
                 // Geo data updated for a specific IP, refresh to get new data
                 fetchPeers();
                 break;
-            case 'keepalive':
-                // Just a keepalive, do nothing
-                break;
         }
     };
 